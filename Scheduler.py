@@ -1,68 +1,172 @@
-from typing import Callable, Any, List, Tuple
+import heapq
+import itertools
+from typing import Callable, Any, Dict, List, Optional, Tuple
+
+
+class ScheduledTask:
+    """Handle to a scheduled function call, returned by schedule_update and schedule_frame."""
+
+    __slots__ = ("func", "args", "due", "seq", "cancelled", "done", "_queue")
+
+    def __init__(self, queue: "_TaskQueue", func: Callable, args: tuple, due: float, seq: int) -> None:
+        self.func = func
+        self.args = args
+        self.due = due
+        self.seq = seq
+        self.cancelled = False
+        self.done = False
+        self._queue = queue
+
+    def __lt__(self, other: "ScheduledTask") -> bool:
+        return (self.due, self.seq) < (other.due, other.seq)
+
+    @property
+    def pending(self) -> bool:
+        return not (self.cancelled or self.done)
+
+    def remaining(self) -> float:
+        """returns the time left in ticks (1/60th of a second) before the call, 0 once it ran or was cancelled."""
+        if not self.pending:
+            return 0
+        return max(0.0, self.due - self._queue.now)
+
+    def cancel(self) -> bool:
+        """cancels the call. Returns True if it was still pending."""
+        if not self.pending:
+            return False
+        self._queue.discard(self)
+        return True
+
+
+class _TaskQueue:
+    """Min-heap of tasks keyed by the absolute tick they are due on.
+
+    Cancelled tasks are only flagged and skipped when they reach the top, so
+    cancelling never has to search the heap.
+    """
+
+    def __init__(self) -> None:
+        self.heap: List[ScheduledTask] = []
+        self.now = 0.0
+        self.live = 0
+        self._seq = itertools.count()
+        # Insertion-ordered per function so cancel_schedule(Func) finds the oldest call in O(1)
+        self._by_func: Dict[Callable, Dict[int, ScheduledTask]] = {}
+
+    def __len__(self) -> int:
+        return self.live
+
+    def clear(self) -> None:
+        for task in self.heap:
+            task.cancelled = True
+        self.heap.clear()
+        self._by_func.clear()
+        self.live = 0
+
+    def push(self, func: Callable, delay: float, args: tuple) -> ScheduledTask:
+        task = ScheduledTask(self, func, args, self.now + delay, next(self._seq))
+        heapq.heappush(self.heap, task)
+        self._by_func.setdefault(func, {})[task.seq] = task
+        self.live += 1
+        return task
+
+    def _forget(self, task: ScheduledTask) -> None:
+        same_func = self._by_func.get(task.func)
+        if same_func is not None:
+            same_func.pop(task.seq, None)
+            if not same_func:
+                del self._by_func[task.func]
+        self.live -= 1
+
+    def discard(self, task: ScheduledTask) -> None:
+        task.cancelled = True
+        self._forget(task)
+        # Rebuild once dead entries dominate so the heap can't grow without bound
+        if len(self.heap) > 64 and self.live < len(self.heap) // 2:
+            self.heap = [t for t in self.heap if t.pending]
+            heapq.heapify(self.heap)
+
+    def first_for(self, func: Callable) -> Optional[ScheduledTask]:
+        same_func = self._by_func.get(func)
+        return next(iter(same_func.values())) if same_func else None
+
+    def advance(self, dt: float) -> None:
+        """runs every task due at the current tick, then moves the clock forward by `dt` seconds."""
+        heap = self.heap
+        due: List[ScheduledTask] = []
+        while heap and heap[0].due <= self.now:
+            task = heapq.heappop(heap)
+            if task.cancelled:
+                continue
+            task.done = True
+            self._forget(task)
+            due.append(task)
+        self.now += 60*dt
+        # Tasks scheduled by these callbacks go into the heap and are kept
+        for task in due:
+            task.func(*task.args)
+
 
 class scheduler:
     def __init__(self) -> None:
-        self.tasks_frame: List[Tuple[Callable, tuple, float]] = []
-        self.tasks_schedule: List[Tuple[Callable, tuple, float]] = []
+        self.tasks_frame = _TaskQueue()
+        self.tasks_schedule = _TaskQueue()
 
     def cancel_all(self) -> None:
         """cancels all scheduled tasks on both the frame and update threads."""
         self.tasks_frame.clear()
         self.tasks_schedule.clear()
-    
+
     def update_frame(self, dt: float) -> None:
-        """updates the frame scheduler, executing any tasks that are due and updating the time left for the remaining tasks.
+        """updates the frame scheduler, executing only the tasks that are due.
 
         Args:
             dt (float): the time in seconds since the last update. The scheduler uses this to determine how much time has passed and whether any tasks are due to be executed.
         """
-        next_tasks = []
-        tasks_to_execute = []
-        for func, args, time_left in self.tasks_frame:
-            if time_left <= 0:
-                tasks_to_execute.append((func, args))
-            else:
-                next_tasks.append((func, args, time_left - 60*dt))
-        for func, args in tasks_to_execute:
-            func(*args)
-        self.tasks_frame = next_tasks
+        self.tasks_frame.advance(dt)
 
     def update_schedule(self, dt: float) -> None:
-        """updates the scheduler, executing any tasks that are due and updating the time left for the remaining tasks.
+        """updates the scheduler, executing only the tasks that are due.
 
         Args:
             dt (float): the time in seconds since the last update. The scheduler uses this to determine how much time has passed and whether any tasks are due to be executed.
         """
-        next_tasks = []
-        tasks_to_execute = []
-        for func, args, time_left in self.tasks_schedule:
-            if time_left <= 0:
-                tasks_to_execute.append((func, args))
-            else:
-                next_tasks.append((func, args, time_left - 60*dt))
-        for func, args in tasks_to_execute:
-            func(*args)
-        self.tasks_schedule = next_tasks
-
-    def schedule_frame(self, Func: Callable, Delay: float, Args: tuple = ()) -> None:
+        self.tasks_schedule.advance(dt)
+
+    def schedule_frame(self, Func: Callable, Delay: float, Args: tuple = ()) -> ScheduledTask:
         """schedules a function call on the frame thread after a certain delay in ticks (1/60th of a second).
 
         Args:
             Func (Callable): the function to call
             Delay (float): delay in ticks (1/60th of a second) before calling the function
             Args (tuple, optional): the argument to the function. Defaults to ().
+
+        Returns:
+            ScheduledTask: handle that can cancel the call or report the time left.
         """
-        self.tasks_frame.append((Func, Args, Delay))
+        return self.tasks_frame.push(Func, Delay, Args)
 
-    def schedule_update(self, Func: Callable, Delay: float, Args: tuple = ()) -> None:
+    def schedule_update(self, Func: Callable, Delay: float, Args: tuple = ()) -> ScheduledTask:
         """schedules an function call on the update thread after a certain delay in ticks (1/60th of a second).
 
         Args:
             Func (Callable): the function to call
             Delay (float): delay in ticks (1/60th of a second) before calling the function
             Args (tuple, optional): the argument to the function. Defaults to ().
+
+        Returns:
+            ScheduledTask: handle that can cancel the call or report the time left.
         """
-        self.tasks_schedule.append((Func, Args, Delay))
+        return self.tasks_schedule.push(Func, Delay, Args)
+
+    @staticmethod
+    def _cancel_first(queue: _TaskQueue, Func: Callable) -> Tuple[Callable, tuple, float]:
+        task = queue.first_for(Func)
+        if task is None:
+            return None
+        time_left = task.remaining()
+        task.cancel()
+        return (task.func, task.args, time_left)
 
     def cancel_frame(self, Func: Callable) -> Tuple[Callable, tuple, float]:
         """cancels a scheduled function call on the frame thread.
@@ -73,11 +177,7 @@ class scheduler:
         Returns:
             Tuple[Callable, tuple, float]: the cancelled function, its arguments, and the time left until it would have been called. Returns None if no such function was found.
         """
-        for i, (F, Args, TimeLeft) in enumerate(self.tasks_frame):
-            if F == Func:
-                del self.tasks_frame[i]
-                return (F, Args, TimeLeft)
-        return None
+        return self._cancel_first(self.tasks_frame, Func)
 
     def cancel_schedule(self, Func: Callable) -> Tuple[Callable, tuple, float]:
         """cancels a scheduled function call on the update thread.
@@ -88,8 +188,4 @@ class scheduler:
         Returns:
             Tuple[Callable, tuple, float]: the cancelled function, its arguments, and the time left until it would have been called. Returns None if no such function was found.
         """
-        for i, (F, Args, TimeLeft) in enumerate(self.tasks_schedule):
-            if F == Func:
-                del self.tasks_schedule[i]
-                return (F, Args, TimeLeft)
-        return None
\ No newline at end of file
+        return self._cancel_first(self.tasks_schedule, Func)
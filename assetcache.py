@@ -0,0 +1,165 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+MAGIC = b"ASAC"
+VERSION = 1
+
+# magic, version, length of the JSON index that follows
+_HEADER = struct.Struct("<4sHI")
+
+
+def file_sha1(path: Path) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+class AssetCache:
+    """Decoded sprites, their collision masks and static sound PCM in one file.
+
+    The file is a small JSON index followed by raw blobs. It is memory-mapped on
+    load and only the blobs that are asked for get copied out. Every entry remembers the
+    size, mtime and SHA-1 of its source; a changed mtime with the same hash is
+    still a hit.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.index: Dict[str, dict] = {}
+        self.blobs: Dict[str, bytes] = {}  # entries added since load, written on save()
+        self.dirty = False
+        self._file = None
+        self._map: Optional[mmap.mmap] = None
+        self._data_start = 0
+
+    def load(self) -> "AssetCache":
+        """Maps the cache file. A missing, outdated or corrupt file just gives an empty cache."""
+        try:
+            self._file = open(self.path, "rb")
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, index_size = _HEADER.unpack_from(self._map, 0)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError("stale asset cache")
+            self.index = json.loads(self._map[_HEADER.size:_HEADER.size + index_size])
+            self._data_start = _HEADER.size + index_size
+        except (OSError, ValueError, struct.error):
+            self.close()
+            self.index = {}
+        return self
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _fresh(self, key: str, source: Path) -> Optional[dict]:
+        entry = self.index.get(key)
+        if entry is None:
+            return None
+        stat = source.stat()
+        if entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            return entry
+        if entry["size"] == stat.st_size and entry["sha1"] == file_sha1(source):
+            # Touched but not changed
+            entry["mtime_ns"] = stat.st_mtime_ns
+            self.dirty = True
+            return entry
+        return None
+
+    def _blob(self, entry: dict, name: str) -> bytes:
+        pending = self.blobs.get(entry["key"] + "/" + name)
+        if pending is not None:
+            return pending
+        offset, length = entry[name]
+        start = self._data_start + offset
+        return self._map[start:start + length]
+
+    def image(self, key: str, source: Path) -> Optional[Tuple[int, int, bytes, np.ndarray]]:
+        """Returns (width, height, RGBA bytes, alpha mask) if the cached copy of `source` is still valid."""
+        entry = self._fresh(key, source)
+        if entry is None or entry["kind"] != "image":
+            return None
+        height, width = entry["shape"]
+        mask = np.frombuffer(self._blob(entry, "mask"), dtype=np.bool_).reshape(height, width)
+        return width, height, self._blob(entry, "rgba"), mask
+
+    def sound(self, key: str, source: Path) -> Optional[Tuple[Tuple[int, int, int], bytes]]:
+        """Returns ((channels, sample_size, sample_rate), PCM bytes) if the cached copy is still valid."""
+        entry = self._fresh(key, source)
+        if entry is None or entry["kind"] != "sound":
+            return None
+        return tuple(entry["format"]), self._blob(entry, "pcm")
+
+    def _put(self, key: str, source: Path, kind: str, blobs: Dict[str, bytes], **meta) -> None:
+        stat = source.stat()
+        self.index[key] = {
+            "key": key,
+            "kind": kind,
+            "source": str(source),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha1": file_sha1(source),
+            "blobs": list(blobs),
+            **meta,
+        }
+        for name, data in blobs.items():
+            self.blobs[key + "/" + name] = data
+        self.dirty = True
+
+    def put_image(self, key: str, source: Path, width: int, height: int, rgba: bytes, mask: np.ndarray) -> None:
+        self._put(key, source, "image", {"rgba": rgba, "mask": mask.astype(np.bool_).tobytes()}, shape=[height, width])
+
+    def put_sound(self, key: str, source: Path, audio_format: Tuple[int, int, int], pcm: bytes) -> None:
+        self._put(key, source, "sound", {"pcm": pcm}, format=list(audio_format))
+
+    def save(self) -> None:
+        """Rewrites the cache if anything changed, through a temp file so a crash can't leave half of one."""
+        if not self.dirty:
+            return
+        chunks = []
+        offset = 0
+        for key, entry in self.index.items():
+            for name in entry["blobs"]:
+                data = self._blob(entry, name)
+                entry[name] = [offset, len(data)]
+                chunks.append(data)
+                offset += len(data)
+        index = json.dumps(self.index).encode()
+
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, len(index)))
+            f.write(index)
+            for data in chunks:
+                f.write(data)
+        self.close()
+        os.replace(tmp, self.path)
+        self.blobs.clear()
+        self.dirty = False
+        self.load()
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    # Asset build step: decode everything and (re)write the cache
+    import pyglet
+    pyglet.options['shadow_window'] = False
+    from resources import resource_manager, default_cache_path
+
+    paths = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    path = paths[0] if paths else default_cache_path()
+    start = time.perf_counter()
+    manager = resource_manager(os.path.dirname(os.path.abspath(__file__)))
+    manager.load_resources(load_sounds="--no-sounds" not in sys.argv, atlas=False, cache_path=path)
+    print(f"asset cache {path}: {manager.cache_hits} cached, {manager.cache_misses} decoded in {time.perf_counter() - start:.2f}s")
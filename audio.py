@@ -0,0 +1,167 @@
+import time
+from typing import Callable, Dict, List, Optional
+
+import pyglet
+from pyglet.media.exceptions import MediaException
+
+# Higher wins when voices run out, so an explosion can cut off a laser
+SOUND_PRIORITIES = {
+    "explosion": 3,
+    "powerup": 2,
+    "Tracking missile": 2,
+    "laser": 1,
+}
+
+# Most voices one sound may hold at a time
+SOUND_CAPS = {
+    "explosion": 4,
+    "powerup": 2,
+    "Tracking missile": 2,
+    "laser": 3,
+}
+
+
+class NullVoice:
+    """Voice that only pretends to play, for headless runs and tests."""
+
+    def __init__(self) -> None:
+        self.plays = 0
+
+    def start(self, source) -> None:
+        self.plays += 1
+
+    def stop(self) -> None:
+        pass
+
+    def delete(self) -> None:
+        pass
+
+
+class PygletVoice:
+    """One reusable pyglet Player."""
+
+    def __init__(self) -> None:
+        self.player = pyglet.media.Player()
+
+    def start(self, source) -> None:
+        player = self.player
+        if player.source is not None:
+            # Drop whatever is still playing, the playlist is empty afterwards
+            player.next_source()
+        player.queue(source)
+        player.play()
+
+    def stop(self) -> None:
+        self.player.pause()
+
+    def delete(self) -> None:
+        self.player.delete()
+
+
+class _Slot:
+    __slots__ = ("voice", "key", "priority", "started", "busy_until")
+
+    def __init__(self, voice) -> None:
+        self.voice = voice
+        self.key: Optional[str] = None
+        self.priority = 0
+        self.started = 0.0
+        self.busy_until = 0.0
+
+
+class VoiceManager:
+    """Plays sound effects on a fixed pool of reusable voices.
+
+    play() only queues a request; update() starts them, at most once per sound
+    however often it was asked for since the last update. A sound never holds
+    more than its cap of voices (its oldest voice is restarted instead), and
+    when every voice is busy a request may take over the oldest voice of a
+    lower-priority sound, otherwise it is dropped.
+    """
+
+    def __init__(
+        self,
+        sounds: Dict[str, "pyglet.media.Source"],
+        voices: int = 8,
+        voice_factory: Callable[[], object] = PygletVoice,
+        priorities: Optional[Dict[str, int]] = None,
+        caps: Optional[Dict[str, int]] = None,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self.sounds = sounds
+        self.priorities = SOUND_PRIORITIES if priorities is None else priorities
+        self.caps = SOUND_CAPS if caps is None else caps
+        self.clock = clock
+        self.slots: List[_Slot] = [_Slot(voice_factory()) for _ in range(voices)]
+        self.pending: Dict[str, int] = {}
+
+        # Stats for the debug overlay
+        self.played = 0
+        self.coalesced = 0
+        self.stolen = 0
+        self.dropped = 0
+        self.errors = 0
+
+    def play(self, key: str) -> None:
+        """Asks for a sound to be played on the next update()."""
+        if key in self.pending:
+            self.coalesced += 1
+        self.pending[key] = self.pending.get(key, 0) + 1
+
+    def update(self) -> None:
+        """Starts the pending sounds, highest priority first."""
+        if not self.pending:
+            return
+        now = self.clock()
+        for key in sorted(self.pending, key=lambda k: -self.priorities.get(k, 0)):
+            self._start(key, now)
+        self.pending.clear()
+
+    def _start(self, key: str, now: float) -> None:
+        source = self.sounds.get(key)
+        if source is None:
+            self.dropped += 1
+            return
+        priority = self.priorities.get(key, 0)
+
+        busy = [slot for slot in self.slots if slot.busy_until > now]
+        same = [slot for slot in busy if slot.key == key]
+        if len(same) >= self.caps.get(key, len(self.slots)):
+            # At the cap: restart the oldest voice of this sound
+            slot = min(same, key=lambda s: s.started)
+        elif len(busy) < len(self.slots):
+            slot = next(slot for slot in self.slots if slot.busy_until <= now)
+        else:
+            victim = min(busy, key=lambda s: (s.priority, s.started))
+            if victim.priority >= priority:
+                self.dropped += 1
+                return
+            slot = victim
+            self.stolen += 1
+
+        try:
+            slot.voice.start(source)
+        except MediaException as e:
+            self.errors += 1
+            print(f"error on playing sound {key}: {e}")
+            return
+        slot.key = key
+        slot.priority = priority
+        slot.started = now
+        slot.busy_until = now + (source.duration or 0.0)
+        self.played += 1
+
+    def busy(self) -> int:
+        now = self.clock()
+        return sum(1 for slot in self.slots if slot.busy_until > now)
+
+    def summary(self) -> str:
+        return (
+            f"Voices: {self.busy()}/{len(self.slots)}, played {self.played}, "
+            f"coalesced {self.coalesced}, stolen {self.stolen}, dropped {self.dropped}"
+        )
+
+    def delete(self) -> None:
+        for slot in self.slots:
+            slot.voice.delete()
+        self.slots.clear()
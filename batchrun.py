@@ -0,0 +1,168 @@
+"""Plays many seeded games headless across processes and reports how they went.
+
+    python batchrun.py --games 200                          # the shipped difficulty
+    python batchrun.py --games 100 --spawn-scale 0.8 1 1.2  # sweep, 100 games per setting
+    python batchrun.py --games 500 --json sweep.json        # also write every game
+"""
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+from bots import BOTS, make_bot
+from difficulty import DifficultyTable
+from engine import GameEngine, headless_registry, FIXED_DT
+from gamestate import game_state
+
+
+class Job(NamedTuple):
+    seed: int
+    bot: str
+    max_ticks: int
+    spawn_scale: float = 1.0
+    large_scale: float = 1.0
+
+
+class GameResult(NamedTuple):
+    seed: int
+    spawn_scale: float
+    large_scale: float
+    score: int
+    ticks: int
+    game_over: bool
+    peak_entities: int
+    tick_p50_ms: float
+    tick_p99_ms: float
+    tick_max_ms: float
+
+
+# One registry and difficulty table per worker process, loaded by _init_worker
+_registry = None
+_tables: Dict[tuple, DifficultyTable] = {}
+
+
+def _init_worker() -> None:
+    global _registry
+    _registry = headless_registry(os.path.dirname(os.path.abspath(__file__)))
+
+
+def play_game(job: Job) -> GameResult:
+    """Plays one game with the bot in control until game over or `job.max_ticks`."""
+    if _registry is None:
+        _init_worker()
+    key = (job.spawn_scale, job.large_scale)
+    table = _tables.get(key)
+    if table is None:
+        table = _tables[key] = DifficultyTable(spawn_scale=job.spawn_scale, large_scale=job.large_scale)
+
+    engine = GameEngine(_registry, save_high_scores=False, bot=make_bot(job.bot), difficulty=table)
+    engine.auto = True
+    engine.start(job.seed)
+    tick_times = np.empty(job.max_ticks)
+    peak = 0
+    ticks = 0
+    clock = time.perf_counter
+    while ticks < job.max_ticks and engine.game_state == game_state.Playing:
+        start = clock()
+        engine.step(FIXED_DT)
+        tick_times[ticks] = clock() - start
+        ticks += 1
+        if len(engine.entities) > peak:
+            peak = len(engine.entities)
+
+    p50, p99 = np.percentile(tick_times[:ticks], (50, 99)) * 1e3 if ticks else (0.0, 0.0)
+    return GameResult(
+        job.seed, job.spawn_scale, job.large_scale, engine.score, ticks,
+        engine.game_state == game_state.GameOver, peak,
+        float(p50), float(p99), float(tick_times[:ticks].max() * 1e3) if ticks else 0.0,
+    )
+
+
+def run_batch(jobs: List[Job], workers: Optional[int] = None) -> List[GameResult]:
+    """Plays every job, spread over `workers` processes (all cores by default). Results keep the job order."""
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return [play_game(job) for job in jobs]
+    # Big enough chunks that the pipe isn't the bottleneck, small enough to keep every core busy
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        return list(pool.map(play_game, jobs, chunksize=chunksize))
+
+
+def summarize(results: List[GameResult]) -> Dict[str, float]:
+    scores = np.array([r.score for r in results], dtype=np.float64)
+    survival = np.array([r.ticks for r in results], dtype=np.float64) * FIXED_DT
+    return {
+        "games": len(results),
+        "game_overs": sum(r.game_over for r in results),
+        "score_mean": float(scores.mean()),
+        "score_median": float(np.median(scores)),
+        "score_min": float(scores.min()),
+        "score_max": float(scores.max()),
+        "survival_mean_s": float(survival.mean()),
+        "survival_median_s": float(np.median(survival)),
+        "peak_entities_max": max(r.peak_entities for r in results),
+        "peak_entities_mean": float(np.mean([r.peak_entities for r in results])),
+        "tick_p50_ms": float(np.median([r.tick_p50_ms for r in results])),
+        "tick_p99_ms": float(np.median([r.tick_p99_ms for r in results])),
+        "tick_max_ms": max(r.tick_max_ms for r in results),
+    }
+
+
+def report(results: List[GameResult]) -> Dict[str, Dict[str, float]]:
+    """Summaries per difficulty setting, keyed 'spawn x<scale> large x<scale>'."""
+    groups: Dict[str, List[GameResult]] = {}
+    for result in results:
+        groups.setdefault(f"spawn x{result.spawn_scale:g} large x{result.large_scale:g}", []).append(result)
+    return {name: summarize(group) for name, group in groups.items()}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=100, help="games per difficulty setting")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game, the rest count up")
+    parser.add_argument("--bot", default="dodge", choices=sorted(BOTS))
+    parser.add_argument("--max-ticks", type=int, default=36_000, help="stop a game after this many ticks (default 10 minutes)")
+    parser.add_argument("--workers", type=int, default=None, help="processes to use (default: all cores)")
+    parser.add_argument("--spawn-scale", type=float, nargs="+", default=[1.0], metavar="SCALE")
+    parser.add_argument("--large-scale", type=float, nargs="+", default=[1.0], metavar="SCALE")
+    parser.add_argument("--json", metavar="PATH", help="write the report and every game to PATH")
+    args = parser.parse_args(argv)
+
+    # Every setting plays the same seeds, so differences come from the setting and not the luck of the draw
+    jobs = [
+        Job(seed, args.bot, args.max_ticks, spawn_scale, large_scale)
+        for spawn_scale, large_scale in itertools.product(args.spawn_scale, args.large_scale)
+        for seed in range(args.seed, args.seed + args.games)
+    ]
+    start = time.perf_counter()
+    results = run_batch(jobs, args.workers)
+    elapsed = time.perf_counter() - start
+    summary = report(results)
+
+    ticks = sum(r.ticks for r in results)
+    print(f"{len(results)} games, {ticks} ticks in {elapsed:.1f}s ({ticks / elapsed:.0f} ticks/s) "
+          f"on {args.workers or os.cpu_count()} workers")
+    for name, stats in summary.items():
+        print(f"\n{name}: {stats['game_overs']}/{stats['games']} game overs")
+        print(f"  score     mean {stats['score_mean']:.0f}, median {stats['score_median']:.0f}, "
+              f"min {stats['score_min']:.0f}, max {stats['score_max']:.0f}")
+        print(f"  survival  mean {stats['survival_mean_s']:.1f}s, median {stats['survival_median_s']:.1f}s")
+        print(f"  entities  peak {stats['peak_entities_max']}, mean peak {stats['peak_entities_mean']:.1f}")
+        print(f"  tick      p50 {stats['tick_p50_ms']:.3f} ms, p99 {stats['tick_p99_ms']:.3f} ms, "
+              f"max {stats['tick_max_ms']:.2f} ms")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"summary": summary, "games": [r._asdict() for r in results]}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,223 @@
+"""Microbenchmarks for the hot paths of the game, run headless.
+
+    python bench.py                          # run and print
+    python bench.py --save bench.json        # also write the results
+    python bench.py --baseline bench.json    # fail if anything got slower than the baseline
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+import timeit
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from difficulty import DIFFICULTY, DifficultyTable
+from engine import GameEngine, InputState, headless_registry, FIXED_DT
+from entities.asteroid import Asteroid
+from entities.laser import Laser
+from entities.TrackingMissile import TrackingMissile
+from Scheduler import scheduler
+from Weapons import WeaponType
+from utils import are_sprites_colliding
+
+ASTEROID_SIZES = {"small": 0.126, "medium": 0.21, "large": 0.35}
+
+
+def measure(func: Callable[[], object], repeat: int = 5, min_time: float = 0.05) -> Dict[str, float]:
+    """Times `func` like timeit: calibrate a loop count, then keep the best and mean per-call time."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_time / 0.2))
+    runs = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {"min_us": min(runs) * 1e6, "mean_us": sum(runs) / len(runs) * 1e6, "calls": number}
+
+
+def bench_collision(registry) -> Dict[str, Callable]:
+    cases = {}
+    for size_name, size in ASTEROID_SIZES.items():
+        for rotation in (0, 45, 90):
+            asteroid = Asteroid(registry.sprite("asteroid"), None, 400, 300, 0, 0, size=size)
+            asteroid.rotation = rotation
+            # Overlapping the edge so the narrow phase always runs
+            laser = Laser(registry.sprite(WeaponType.laser.value), 400 + asteroid.width / 3, 300, 0, None)
+            cases[f"collision/{size_name}/rot{rotation}"] = lambda a=asteroid, l=laser: are_sprites_colliding(a, l)
+    return cases
+
+
+def bench_scheduler() -> Dict[str, Callable]:
+    cases = {}
+    for count in (10, 1_000, 100_000):
+        s = scheduler()
+        for i in range(count):
+            # Far enough in the future that nothing fires while timing
+            s.schedule_update(setattr, 1e9 + i, (s, "fired", True))
+        cases[f"scheduler/update_schedule/{count}"] = lambda s=s: s.update_schedule(FIXED_DT)
+    return cases
+
+
+def bench_explode(registry) -> Dict[str, Callable]:
+    asteroid = Asteroid(registry.sprite("asteroid"), None, 400, 300, 100, -100, size=0.35, type_val=3)
+    return {"asteroid/explode": asteroid.explode}
+
+
+def bench_spawn(registry) -> Dict[str, Callable]:
+    rng = np.random.default_rng(0)
+    engine = GameEngine(registry, save_high_scores=False)
+    engine.start(seed=0)
+
+    def wave(engine=engine):
+        engine.spawn_wave(100)
+        # Hand them straight back so the pool serves the next wave
+        for entity in list(engine.entities):
+            engine.entities.remove(entity)
+            engine.kinematics.remove(entity)
+            engine.pool.release(entity)
+
+    return {
+        "difficulty/spawn_rate": lambda: DIFFICULTY.spawn_rate(12_345),
+        "difficulty/wave/100": lambda: DIFFICULTY.wave(rng, 100, 12_345, 800, 600),
+        "engine/spawn_wave/100": wave,
+    }
+
+
+# Benched engines never spawn on their own, so the population is whatever the bench puts in
+NO_SPAWNS = DifficultyTable(spawn_scale=0)
+
+
+def random_asteroid(engine: GameEngine) -> Asteroid:
+    return engine.pool.acquire(
+        Asteroid, engine.registry.sprite("asteroid"), engine.batch,
+        random.uniform(0, engine.width), random.uniform(0, engine.height), 0, 0,
+        size=random.choice(list(ASTEROID_SIZES.values())),
+    )
+
+
+def populated_engine(registry, count: int) -> GameEngine:
+    """An engine mid-game with `count` stationary asteroids, an invulnerable player and no spawning."""
+    engine = GameEngine(registry, save_high_scores=False, difficulty=NO_SPAWNS)
+    engine.start(seed=count)
+    engine.player.is_vulnerable = False
+    for _ in range(count):
+        engine.add_entity(random_asteroid(engine))
+    return engine
+
+
+def hold_asteroids(engine: GameEngine, count: int) -> None:
+    """Trims or refills the hostiles to exactly `count`.
+
+    Lasers clear the field and every split leaves fragments behind, so without
+    this the population drifts with the number of calls measure() picks.
+    """
+    hostiles = engine.entities.hostiles
+    if len(hostiles) > count:
+        # The newest ones, i.e. the fragments
+        for entity in list(hostiles)[count:]:
+            engine.entities.remove(entity)
+            engine.kinematics.remove(entity)
+            engine.pool.release(entity)
+    while len(hostiles) < count:
+        engine.add_entity(random_asteroid(engine))
+
+
+def bench_missile(registry) -> Dict[str, Callable]:
+    cases = {}
+    for count in (10, 100, 1_000):
+        engine = populated_engine(registry, count)
+        missile = TrackingMissile(registry.sprite(WeaponType.tracking_missile.value), 400, 100, 0, None)
+        cases[f"missile/find_target_in_fov/{count}"] = lambda m=missile, e=engine: m.find_target_in_fov(e)
+        # A salvo of missiles retargeting in the same tick
+        salvo = [
+            TrackingMissile(registry.sprite(WeaponType.tracking_missile.value), 400, 100, rotation, None)
+            for rotation in range(-60, 60, 10)
+        ]
+        cases[f"missile/find_targets_in_fov/12x{count}"] = lambda s=salvo, e=engine: TrackingMissile.find_targets_in_fov(s, e)
+    return cases
+
+
+def bench_bot(registry) -> Dict[str, Callable]:
+    cases = {}
+    for count in (10, 100, 1_000):
+        engine = populated_engine(registry, count)
+        cases[f"bot/observe/{count}"] = lambda e=engine: e.observe(FIXED_DT)
+        cases[f"bot/dodge/act/{count}"] = lambda e=engine, o=engine.observe(FIXED_DT): e.bot.act(o)
+    return cases
+
+
+def bench_tick(registry) -> Dict[str, Callable]:
+    cases = {}
+    for count in (50, 200, 1_000):
+        engine = populated_engine(registry, count)
+        inputs = InputState(aim_x=400, aim_y=600, firing=True)
+
+        def tick(engine=engine, inputs=inputs, count=count):
+            engine.step(FIXED_DT, inputs)
+            hold_asteroids(engine, count)
+
+        cases[f"engine/step/{count}"] = tick
+    return cases
+
+
+def run(names: List[str]) -> Dict[str, Dict[str, float]]:
+    registry = headless_registry(os.path.dirname(os.path.abspath(__file__)))
+    cases: Dict[str, Callable] = {}
+    cases.update(bench_collision(registry))
+    cases.update(bench_scheduler())
+    cases.update(bench_explode(registry))
+    cases.update(bench_spawn(registry))
+    cases.update(bench_missile(registry))
+    cases.update(bench_bot(registry))
+    cases.update(bench_tick(registry))
+
+    results = {}
+    for name, func in cases.items():
+        if names and not any(name.startswith(prefix) for prefix in names):
+            continue
+        results[name] = measure(func)
+        print(f"{name:45s} {results[name]['min_us']:12.2f} us  (mean {results[name]['mean_us']:.2f})")
+    return results
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], tolerance: float) -> List[str]:
+    """Returns a line per benchmark whose best time got more than `tolerance` slower than the baseline."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        ratio = result["min_us"] / base["min_us"] if base["min_us"] > 0 else math.inf
+        if ratio > 1 + tolerance:
+            regressions.append(f"{name}: {base['min_us']:.2f} us -> {result['min_us']:.2f} us ({ratio:.2f}x)")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Astro Shooter microbenchmarks")
+    parser.add_argument("names", nargs="*", help="only run benchmarks starting with these prefixes")
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against this JSON file and fail on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed slowdown before failing (default 0.5 = 50%%)")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    results = run(args.names)
+    print(f"done in {time.perf_counter() - started:.1f}s")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("\nREGRESSIONS:")
+            for line in regressions:
+                print("  " + line)
+            sys.exit(1)
+        print(f"no regressions against {args.baseline}")
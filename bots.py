@@ -0,0 +1,119 @@
+import math
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+
+class Observation(NamedTuple):
+    """What a bot sees of one tick. The entity arrays have one (x, y) row per entity."""
+    player: np.ndarray  # (2,)
+    hostile_pos: np.ndarray  # (n, 2)
+    hostile_vel: np.ndarray  # (n, 2)
+    powerup_pos: np.ndarray  # (m, 2)
+    powerup_vel: np.ndarray  # (m, 2)
+    width: int
+    height: int
+    dt: float
+
+
+class Action(NamedTuple):
+    """What a bot wants to do this tick."""
+    move_x: float = 0.0  # direction to thrust in, only the sign of each axis matters
+    move_y: float = 0.0
+    aim_x: Optional[float] = None  # None keeps the current aim
+    aim_y: Optional[float] = None
+    firing: Optional[bool] = None  # None keeps the current trigger state
+
+
+class Bot:
+    """Plays the game: gets an Observation every tick it is in control and returns an Action.
+
+    A bot must only depend on what it observed (and its own state, cleared in
+    reset()) so that replays of games it played stay exact. This base bot
+    does nothing.
+    """
+
+    def reset(self) -> None:
+        """Called when a new game starts."""
+
+    def act(self, obs: Observation) -> Action:
+        return Action()
+
+
+def radius_query(offsets: np.ndarray, d2: np.ndarray, radius: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Picks the points strictly inside `radius`, excluding ones right on the center.
+
+    Args:
+        offsets (np.ndarray): (n, 2) center - point for every point
+        d2 (np.ndarray): (n,) their squared lengths
+        radius (float): search radius
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: the offsets of the hits, shape (k, 2), and their distances, shape (k,).
+    """
+    inside = (d2 > 0) & (d2 < radius * radius)
+    return offsets[inside], np.sqrt(d2[inside])
+
+
+def closest(points: np.ndarray, center: np.ndarray) -> Optional[int]:
+    """Index of the point closest to `center` (the first one on a tie), None if there are none."""
+    if len(points) == 0:
+        return None
+    offsets = points - center
+    return int(np.argmin(np.einsum("ij,ij->i", offsets, offsets)))
+
+
+class DodgeBot(Bot):
+    """Aims with some lead at the closest hostile and keeps firing, dodges every hostile
+    within `danger_radius`, and otherwise collects power-ups or drifts back to the center."""
+
+    def __init__(self, danger_radius: float = 120.0, lead: float = 0.1) -> None:
+        self.danger_radius = danger_radius
+        self.lead = lead
+
+    def act(self, obs: Observation) -> Action:
+        player = obs.player
+        px, py = player.tolist()
+        # One distance pass over the hostiles serves both the target and the dodge
+        offsets = player - obs.hostile_pos
+        d2 = np.einsum("ij,ij->i", offsets, offsets)
+
+        aim_x = aim_y = None
+        if len(d2):
+            target = int(d2.argmin())
+            x, y = obs.hostile_pos[target].tolist()
+            vel_x, vel_y = obs.hostile_vel[target].tolist()
+            lead = obs.dt * math.sqrt(d2[target]) * self.lead
+            aim_x, aim_y = x + vel_x * lead, y + vel_y * lead
+
+        # Repulsion from everything nearby, closer pushes harder
+        avoid_x = avoid_y = 0.0
+        near, distances = radius_query(offsets, d2, self.danger_radius)
+        if len(distances):
+            weights = (self.danger_radius - distances) / (self.danger_radius * distances)
+            avoid_x, avoid_y = (near * weights[:, None]).sum(axis=0).tolist()
+
+        if math.hypot(avoid_x, avoid_y) > 0.1:
+            move_x, move_y = avoid_x, avoid_y
+        else:
+            powerup = closest(obs.powerup_pos, player)
+            if powerup is not None:
+                x, y = obs.powerup_pos[powerup].tolist()
+                move_x, move_y = x - px, y - py
+            else:
+                move_x, move_y = obs.width / 2 - px, obs.height / 2 - py
+        return Action(move_x, move_y, aim_x, aim_y, firing=True if aim_x is not None else None)
+
+
+# Bots by name, for the command line
+BOTS: Dict[str, Callable[[], Bot]] = {
+    "dodge": DodgeBot,
+    "idle": Bot,
+}
+
+
+def make_bot(name: str) -> Bot:
+    try:
+        return BOTS[name]()
+    except KeyError:
+        raise ValueError(f"unknown bot {name!r}, expected one of {', '.join(BOTS)}") from None
@@ -0,0 +1,95 @@
+from typing import NamedTuple
+
+import numpy as np
+
+# Scale of an asteroid for each type_val (1 = small, 3 = large)
+ASTEROID_SIZES = (0.126, 0.21, 0.35)
+
+SCORE_BUCKET = 10
+MAX_SCORE = 200_000  # both curves are flat long before this, higher scores use the last bucket
+
+
+def spawn_rate_curve(score: np.ndarray) -> np.ndarray:
+    """Asteroid spawn chance in % per tick.
+
+    log formula for spawn rate:
+    f(0) = 2
+    f(5000) = 3
+    f(15000) = 5
+    """
+    return 6.69578 / (1 + np.exp(-((0.000128988 * score) - 0.853516)))
+
+
+def size_weights_curve(spawn_rate: np.ndarray) -> np.ndarray:
+    """Relative odds of a small, medium and large asteroid at a given spawn rate, shape (n, 3)."""
+    small = 122.42384 / (1 + np.exp(-((-0.340352 * spawn_rate) + 0.310192)))
+    medium = np.full_like(spawn_rate, 35.0)
+    large = 3500650.29 / (1 + np.exp(-((0.256397 * spawn_rate) - 12.8732)))
+    return np.stack([small, medium, large], axis=-1)
+
+
+class Wave(NamedTuple):
+    """A batch of asteroids to spawn, one array entry per asteroid."""
+    x: np.ndarray
+    y: np.ndarray
+    vel_x: np.ndarray
+    vel_y: np.ndarray
+    type_val: np.ndarray
+
+
+class DifficultyTable:
+    """The difficulty curves sampled once per score bucket, so a lookup is a list index.
+
+    spawn_scale multiplies the spawn rate and large_scale the odds of a large
+    asteroid, for balancing sweeps; the defaults are the shipped game.
+    """
+
+    def __init__(self, bucket: int = SCORE_BUCKET, max_score: int = MAX_SCORE,
+                 spawn_scale: float = 1.0, large_scale: float = 1.0) -> None:
+        self.bucket = bucket
+        self.spawn_scale = spawn_scale
+        self.large_scale = large_scale
+        scores = np.arange(0, max_score + bucket, bucket, dtype=np.float64)
+        rates = spawn_rate_curve(scores)
+        weights = size_weights_curve(rates)
+        weights[:, 2] *= large_scale
+        rates = rates * spawn_scale
+        cdf = np.cumsum(weights, axis=1)
+        cdf /= cdf[:, -1:]
+        self.spawn_rates = rates.tolist()
+        self.size_cdf = cdf
+        self.last = len(self.spawn_rates) - 1
+
+    def index(self, score: int) -> int:
+        i = score // self.bucket
+        return i if i < self.last else self.last
+
+    def spawn_rate(self, score: int) -> float:
+        return self.spawn_rates[self.index(score)]
+
+    def wave(self, rng: np.random.Generator, count: int, score: int, width: int, height: int) -> Wave:
+        """Draws `count` asteroids entering from the top, left or right edge.
+
+        Args:
+            rng (np.random.Generator): the engine's generator, so waves replay exactly
+            count (int): number of asteroids
+            score (int): picks the size distribution
+            width (int): play area width
+            height (int): play area height
+
+        Returns:
+            Wave: positions, velocities and type_val (1-3) of every asteroid.
+        """
+        side = rng.integers(0, 3, count)  # 0 top, 1 left, 2 right
+        top, left = side == 0, side == 1
+        u = rng.random((3, count))
+
+        x = np.where(top, rng.integers(0, width + 1, count), np.where(left, -50, width + 50)).astype(np.float64)
+        y = np.where(top, height + 50, rng.integers(0, height + 1, count)).astype(np.float64)
+        vel_x = np.where(top, -100 + 200 * u[0], np.where(left, 100 + 100 * u[0], -200 + 100 * u[0]))
+        vel_y = np.where(top, -200 + 100 * u[1], -50 + 100 * u[1])
+        type_val = np.searchsorted(self.size_cdf[self.index(score)], u[2], side="right") + 1
+        return Wave(x, y, vel_x, vel_y, np.minimum(type_val, len(ASTEROID_SIZES)))
+
+
+DIFFICULTY = DifficultyTable()
@@ -0,0 +1,437 @@
+import itertools
+import os
+import random
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pyglet
+
+from entities.player import Player
+from entities.asteroid import Asteroid
+from entities.explosion import Explosion
+from entities.powerup import PowerUp
+from entities.TrackingMissile import TrackingMissile
+from entities.GameObject import GameObject
+from entities.HostileObject import HostileObject
+from highscore import HighScoreStore
+from gamestate import game_state
+from utils import are_sprites_colliding, sprites_colliding_with
+from Weapons import WeaponType
+from Scheduler import scheduler, ScheduledTask
+from spatial import SpatialHash
+from kinematics import KinematicsStore
+from pool import ObjectPool
+from entityindex import EntityIndex, Handle
+from timing import PhaseTimer
+from difficulty import DIFFICULTY, ASTEROID_SIZES, DifficultyTable
+from bots import Bot, DodgeBot, Observation, make_bot, BOTS
+
+# Constants
+WIDTH, HEIGHT = 800, 600
+FIXED_DT = 1 / 60.0
+
+# Phases timed in every tick. "ui" is the window's HUD update, once per frame, charged to the frame's last tick
+TICK_PHASES = ("scheduler", "autopilot", "player", "entities", "collision", "cleanup", "firing", "spawning", "ui")
+
+
+@dataclass
+class InputState:
+    """Everything the player can do during one tick."""
+    up: bool = False
+    down: bool = False
+    left: bool = False
+    right: bool = False
+    aim_x: float = WIDTH // 2
+    aim_y: float = HEIGHT // 2
+    firing: bool = False
+    weapon: int = -1  # unlocked weapon slot to switch to this tick, -1 keeps the current one
+
+
+def headless_registry(base_dir: str):
+    """Loads the sprite images without opening a window, a GL context or the audio device."""
+    # Image data is decoded on the CPU, the GL texture is only created once a Sprite uses it
+    pyglet.options['shadow_window'] = False
+    from resources import resource_manager
+    return resource_manager(base_dir).load_resources(load_sounds=False, atlas=False)
+
+
+class GameEngine(pyglet.event.EventDispatcher):
+    """The whole simulation: entities, Scheduler, score, spawning and collisions.
+
+    Nothing here needs a window, GL context or audio device. Pass a batch to get
+    sprite views for rendering; without one the engine runs headless. Driven by
+    step(dt, inputs), it reports what happened through pyglet events.
+    """
+
+    def __init__(self, registry, width: int = WIDTH, height: int = HEIGHT, batch=None, save_high_scores: bool = True,
+                 bot: Optional[Bot] = None, difficulty: Optional[DifficultyTable] = None):
+        self.registry = registry
+        self.width = width
+        self.height = height
+        self.batch = batch
+        self.save_high_scores = save_high_scores
+        self.inputs = InputState(aim_x=width // 2, aim_y=height // 2)
+
+        # Game Objects
+        self.player = Player(self.registry.sprite("player"), width // 2, height // 2, batch)
+        self.entities = EntityIndex()
+        # Broad phase, weapons get their own grid so hostiles never walk past each other
+        self.spatial_hash = SpatialHash(cell_size=64)
+        self.weapon_hash = SpatialHash(cell_size=64)
+        self.kinematics = KinematicsStore()
+        self.pool = ObjectPool()
+
+        # State
+        self.score = 0
+        self.lives = 3
+        # Written behind on a thread, only headless runs skip it
+        self.high_scores = HighScoreStore() if save_high_scores else None
+        self.high_score = self.high_scores.value if self.high_scores is not None else 0
+        self.game_state = game_state.Menu
+
+        # Scheduler
+        self.Scheduler: scheduler = scheduler()
+        self.powerup_timers: Dict[str, ScheduledTask] = {}
+
+        # Shooting
+        self.fire_cooldown = 0
+        self.fire_rate = 0.15  # Base fire rate
+        self.unlocked_weapon = [WeaponType.laser]
+        self.weapon = WeaponType.laser
+        self.split_fire = False
+
+        # Spawning
+        self.difficulty = difficulty if difficulty is not None else DIFFICULTY
+        self.asteroid_spawn_rate = 2  # % chance per frame
+
+        # Bot, plays instead of the inputs while auto is on
+        self.auto = False
+        self.bot: Bot = bot if bot is not None else DodgeBot()
+
+        # Determinism, every random draw in the simulation comes from the global `random`
+        # or, for batched draws, this generator; both are seeded by start()
+        self.seed: Optional[int] = None
+        self.rng = np.random.default_rng()
+        self.ticks = 0
+
+        # Profiling
+        self.timings = PhaseTimer(TICK_PHASES)
+
+    def play(self, key: str) -> None:
+        self.dispatch_event('on_sound', key)
+
+    def start(self, seed: Optional[int] = None) -> None:
+        """Starts a new game. The same seed and the same inputs replay the game exactly."""
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(63)
+        self.seed = seed
+        random.seed(seed)
+        self.rng = np.random.default_rng(seed)
+        self.ticks = 0
+        self.reset_game()
+        self.bot.reset()
+        self.game_state = game_state.Playing
+
+    def reset_game(self):
+        self.score = 0
+        self.lives = 3
+        def clear_entitys(l: EntityIndex):
+            for item in l:
+                self.pool.release(item)
+            l.clear()
+        clear_entitys(self.entities)
+        self.kinematics.clear()
+
+        self.Scheduler.cancel_all()
+        self.powerup_timers.clear()
+
+        self.player.reset(self.width // 2, self.height // 2)
+
+        self.fire_cooldown = 0
+
+        self.split_fire = False
+        self.fire_rate = 0.15
+        self.asteroid_spawn_rate = 2
+        self.weapon = WeaponType.laser
+        self.unlocked_weapon = [WeaponType.laser]
+
+    def select_weapon(self, index: int) -> None:
+        if self.game_state == game_state.Playing and index < len(self.unlocked_weapon):
+            self.weapon = self.unlocked_weapon[index]
+
+    def step(self, dt: float, inputs: Optional[InputState] = None) -> None:
+        """Advances the simulation by `dt` seconds.
+
+        Args:
+            dt (float): the time in seconds to simulate
+            inputs (InputState, optional): the player input for this tick. Defaults to the previous one.
+        """
+        if inputs is not None:
+            self.inputs = inputs
+        if self.game_state != game_state.Playing:
+            return
+        self.ticks += 1
+        timings = self.timings
+        timings.begin()
+
+        # The renderer draws between the previous and this tick, headless runs skip the copy
+        if self.batch is not None:
+            self.player.save_previous()
+            for entity in self.entities:
+                entity.save_previous()
+
+        if self.inputs.weapon >= 0:
+            self.select_weapon(self.inputs.weapon)
+
+        # Update scheduler tasks
+        self.Scheduler.update_schedule(dt)
+        timings.mark("scheduler")
+
+        if self.auto:
+            self.autopilot(dt)
+        timings.mark("autopilot")
+
+        # Update Player (with bounds)
+        self.player.update(dt, self)
+        timings.mark("player")
+
+        # Update the entities, straight-line movers are integrated in one batch
+        entities_to_append: List[GameObject] = []
+        self.kinematics.step(dt, self.width, self.height)
+        TrackingMissile.acquire_targets(self)
+        for entity in self.entities:
+            if not entity.kinematic:
+                entity.update(dt, self)
+        timings.mark("entities")
+
+        # Broad phase: the player only meets hostiles and power-ups, hostiles only meet weapons
+        self.spatial_hash.rebuild(itertools.chain(self.entities.hostiles, self.entities.powerups))
+        self.weapon_hash.rebuild(self.entities.weapons)
+
+        # Player collisions
+        for entity in self.spatial_hash.query(self.player):
+            if not entity.active:
+                continue
+            if isinstance(entity, HostileObject) and self.player.is_vulnerable:
+                if are_sprites_colliding(entity, self.player):
+                    self.lives -= 1
+                    self.player.is_vulnerable = False
+                    self.Scheduler.schedule_update(
+                        lambda player: setattr(player, 'is_vulnerable', True), 5, (self.player,)
+                    )
+                    entities_to_append.append(
+                        self.pool.acquire(Explosion, self.registry.sprite("explosion"), entity.x, entity.y, self.batch)
+                    )
+                    self.play("explosion")
+                    entity.deactivate()
+                    if self.lives <= 0:
+                        # Still add the explosion, so it is shown on the game over screen and
+                        # released with everything else when the next game starts
+                        for pending in entities_to_append:
+                            self.add_entity(pending)
+                        self.game_over()
+                        return
+
+            elif isinstance(entity, PowerUp):
+                if are_sprites_colliding(entity, self.player):
+                    entity.apply(self)
+                    self.play("powerup")
+                    entity.deactivate()
+
+        # Entity collisions
+        for entity1 in self.entities.hostiles:
+            if not entity1.active:
+                continue
+            candidates = [other for other in self.weapon_hash.query(entity1) if other.active]
+            if not candidates:
+                continue
+            for index in sprites_colliding_with(entity1, candidates):
+                if not entity1.active:
+                    break
+                entity2 = candidates[index]
+                if isinstance(entity1, Asteroid):
+                    self.score += int(100 * entity1.scale)
+                    entities_to_append.extend(entity1.explode(self.pool))
+                    entity1.deactivate()
+                entities_to_append.append(
+                    self.pool.acquire(Explosion, self.registry.sprite("explosion"), entity2.x, entity2.y, self.batch)
+                )
+                if random.random() < 0.15:
+                    self.spawn_powerup(entity1.x, entity1.y)
+                self.play("explosion")
+                entity2.deactivate()
+        timings.mark("collision")
+
+        for entity in entities_to_append:
+            self.add_entity(entity)
+        for entity in [entity for entity in self.entities if not entity.active]:
+            self.entities.remove(entity)
+            if entity.kinematic:
+                self.kinematics.remove(entity)
+            self.pool.release(entity)
+
+        # Game over check
+        if self.lives <= 0:
+            self.game_over()
+        timings.mark("cleanup")
+
+        # Shooting
+        self.fire_cooldown -= dt
+        if self.inputs.firing and self.fire_cooldown <= 0:
+            self.fire_cooldown = self.fire_rate
+
+            weapon_str = self.weapon.value
+            Weapon_to_spawn = WeaponType.str_to_class(weapon_str)
+
+            self.play(weapon_str)
+            if self.split_fire:
+                self.add_entity(self.pool.acquire(Weapon_to_spawn, self.registry.sprite(weapon_str), self.player.x, self.player.y, self.player.rotation - 10, self.batch))
+                self.add_entity(self.pool.acquire(Weapon_to_spawn, self.registry.sprite(weapon_str), self.player.x, self.player.y, self.player.rotation + 10, self.batch))
+            self.add_entity(self.pool.acquire(Weapon_to_spawn, self.registry.sprite(weapon_str), self.player.x, self.player.y, self.player.rotation, self.batch))
+        timings.mark("firing")
+
+        # Spawn Asteroids, an integer roll like the original randrange(0, 100): a fractional
+        # rate fires on ceil(rate)% of ticks, which is what the curve was tuned against
+        if self.rng.integers(0, 100) < self.asteroid_spawn_rate:
+            self.spawn_asteroid()
+
+        if self.score > self.high_score:
+            self.high_score = self.score
+            if self.high_scores is not None:
+                self.high_scores.set(self.score)
+
+        # Increase difficulty
+        self.asteroid_spawn_rate = self.difficulty.spawn_rate(self.score)
+
+        if WeaponType.tracking_missile_condition(score=self.score) and WeaponType.tracking_missile not in self.unlocked_weapon:
+            self.unlocked_weapon.append(WeaponType.tracking_missile)
+            self.dispatch_event('on_weapon_unlocked', WeaponType.tracking_missile)
+        timings.mark("spawning")
+
+    def observe(self, dt: float) -> Observation:
+        """Snapshot of the play area for a bot, as NumPy arrays."""
+        # Hostiles all move in straight lines, the KinematicsStore already has them as arrays
+        hostiles = self.kinematics.hostiles()
+        # Power-ups only fall, straight down
+        powerups = np.fromiter((v for p in self.entities.powerups for v in (p.x, p.y, 0.0, p.y_speed)),
+                               np.float64, 4 * len(self.entities.powerups)).reshape(-1, 4)
+        return Observation(
+            np.array([self.player.x, self.player.y], dtype=np.float64),
+            hostiles[:, :2], hostiles[:, 2:],
+            powerups[:, :2], powerups[:, 2:],
+            self.width, self.height, dt,
+        )
+
+    def autopilot(self, dt: float) -> None:
+        """Lets the bot steer and fire by rewriting the current inputs."""
+        action = self.bot.act(self.observe(dt))
+        inputs = self.inputs
+        if action.aim_x is not None:
+            inputs.aim_x, inputs.aim_y = action.aim_x, action.aim_y
+        if action.firing is not None:
+            inputs.firing = action.firing
+        # Convert desired direction into key presses
+        inputs.left = action.move_x < -0.1
+        inputs.right = action.move_x > 0.1
+        inputs.down = action.move_y < -0.1
+        inputs.up = action.move_y > 0.1
+
+    def run(self, max_ticks: int, dt: float = FIXED_DT) -> int:
+        """Steps with the bot in control until game over or `max_ticks`, returns the ticks run."""
+        self.auto = True
+        ticks = 0
+        while ticks < max_ticks and self.game_state == game_state.Playing:
+            self.step(dt)
+            ticks += 1
+        return ticks
+
+    def spawn_asteroid(self):
+        self.spawn_wave(1)
+
+    def spawn_wave(self, count: int) -> None:
+        """Spawns `count` asteroids at once, sized by the difficulty at the current score."""
+        wave = self.difficulty.wave(self.rng, count, self.score, self.width, self.height)
+        image = self.registry.sprite("asteroid")
+        for x, y, vx, vy, type_val in zip(
+            wave.x.tolist(), wave.y.tolist(), wave.vel_x.tolist(), wave.vel_y.tolist(), wave.type_val.tolist()
+        ):
+            self.add_entity(self.pool.acquire(
+                Asteroid, image, self.batch, x, y, vx, vy, type_val=type_val, size=ASTEROID_SIZES[type_val - 1]
+            ))
+
+    def spawn_powerup(self, x, y):
+        self.add_entity(self.pool.acquire(PowerUp, self.registry.sprite("powerup"), x, y, self.batch))
+
+    def add_entity(self, entity: GameObject):
+        self.entities.add(entity)
+        if entity.kinematic:
+            self.kinematics.add(entity)
+        if entity.lifetime is not None:
+            self.schedule_for(entity, entity.lifetime, GameObject.deactivate)
+
+    def schedule_for(self, entity: GameObject, delay: float, func: Callable, args: tuple = ()) -> ScheduledTask:
+        """Schedules func(entity, *args) on the update thread, skipped if the entity left play by then.
+
+        Only the entity's handle is captured, so a pooled object that was reused
+        in the meantime is not touched.
+        """
+        return self.Scheduler.schedule_update(self._call_if_alive, delay, (entity.handle, func, args))
+
+    def _call_if_alive(self, handle: Handle, func: Callable, args: tuple) -> None:
+        entity = self.entities.get(handle)
+        if entity is not None:
+            func(entity, *args)
+
+    def game_over(self):
+        self.game_state = game_state.GameOver
+        new_high_score = self.score > self.high_score
+        if new_high_score:
+            self.high_score = self.score
+            if self.high_scores is not None:
+                self.high_scores.set(self.score)
+        if self.high_scores is not None:
+            self.high_scores.flush()
+        self.dispatch_event('on_game_over', new_high_score)
+
+    def close(self):
+        """Writes out anything still pending, call once the engine is done with."""
+        if self.high_scores is not None:
+            self.high_scores.close()
+        self.timings.close()
+
+    # Events, handlers are optional so a headless run can ignore all of them
+    def on_sound(self, key: str):
+        """A sound effect should be played."""
+
+    def on_weapon_unlocked(self, weapon: WeaponType):
+        """A new weapon became available."""
+
+    def on_game_over(self, new_high_score: bool):
+        """The last life was lost."""
+
+
+GameEngine.register_event_type('on_sound')
+GameEngine.register_event_type('on_weapon_unlocked')
+GameEngine.register_event_type('on_game_over')
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    # Headless soak: a bot plays for a fixed number of ticks
+    parser = argparse.ArgumentParser(description="Astro Shooter headless soak")
+    parser.add_argument("--bot", default="dodge", choices=sorted(BOTS))
+    parser.add_argument("--ticks", type=int, default=10000)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+    engine = GameEngine(headless_registry(os.path.dirname(__file__)), save_high_scores=False, bot=make_bot(args.bot))
+    engine.start(args.seed)
+    start = time.perf_counter()
+    ticks = engine.run(args.ticks)
+    elapsed = time.perf_counter() - start
+    print(f"{ticks} ticks in {elapsed:.2f}s ({ticks / elapsed:.0f} ticks/s), score {engine.score}")
+    print("per phase min/avg/p99:")
+    for line in engine.timings.summary():
+        print("  " + line)
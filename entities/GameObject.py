@@ -0,0 +1,115 @@
+import pyglet
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from engine import GameEngine
+
+class GameObject:
+    """Common base class for all game objects.
+
+    Holds the simulation state only. When a batch is given a pyglet Sprite is
+    attached as the view, and the renderer pushes the state to it once per frame
+    with sync_sprite(). Without a batch the object runs headless.
+    """
+
+    # Straight-line movers are integrated by the KinematicsStore instead of update()
+    kinematic = False
+    bounds_margin = 0
+    hostile = False
+    # Ticks until the engine deactivates it, None lives until something else does
+    lifetime: Optional[int] = None
+
+    def __init__(self, img, x, y, batch=None):
+        self.image = img
+        self.batch = batch
+        self.x = x
+        self.y = y
+        self.rotation = 0.0
+        self.scale = 1.0
+        self.scale_x = 1.0
+        self.scale_y = 1.0
+        self.active = True
+        # Set by the EntityIndex while the object is in play
+        self.handle = None
+
+        # State at the start of the tick for render interpolation, None until the engine saves one
+        self.prev_x: Optional[float] = None
+        self.prev_y: Optional[float] = None
+        self.prev_rotation: Optional[float] = None
+
+        # A pooled object being reset keeps its sprite, it only needs to be shown again
+        sprite: Optional["pyglet.sprite.Sprite"] = getattr(self, "sprite", None)
+        if sprite is not None and sprite.batch is batch:
+            if sprite.image is not img:
+                sprite.image = img
+            sprite.visible = True
+        else:
+            if sprite is not None:
+                sprite.delete()
+            sprite = pyglet.sprite.Sprite(img, x=x, y=y, batch=batch) if batch is not None else None
+        self.sprite = sprite
+
+    @property
+    def width(self) -> float:
+        return self.image.width * abs(self.scale_x * self.scale)
+
+    @property
+    def height(self) -> float:
+        return self.image.height * abs(self.scale_y * self.scale)
+
+    def save_previous(self) -> None:
+        self.prev_x = self.x
+        self.prev_y = self.y
+        self.prev_rotation = self.rotation
+
+    def sync_sprite(self, alpha: float = 1.0) -> None:
+        """Pushes position, rotation and scale to the sprite view in one update.
+
+        Args:
+            alpha (float, optional): how far to draw between the previous and the current tick. Defaults to 1.0 (current).
+        """
+        sprite = self.sprite
+        if sprite is None:
+            return
+        x, y, rotation = self.x, self.y, self.rotation
+        if alpha < 1.0 and self.prev_x is not None:
+            x = self.prev_x + (x - self.prev_x) * alpha
+            y = self.prev_y + (y - self.prev_y) * alpha
+            # Shortest way round so 359 -> 1 doesn't spin the sprite backwards
+            rotation = self.prev_rotation + ((rotation - self.prev_rotation + 180) % 360 - 180) * alpha
+        scale = self.scale if self.scale != sprite.scale else None
+        sprite.update(x=x, y=y, rotation=rotation, scale=scale)
+
+    def reset(self, *args, **kwargs) -> None:
+        """Reinitializes a pooled object with its constructor arguments.
+
+        Subclasses holding extra resources can override this; the default simply
+        runs __init__ again, which reuses the existing sprite.
+        """
+        self.__init__(*args, **kwargs)
+
+    def hide(self) -> None:
+        """Hides the sprite view without giving up its slot in the Batch."""
+        if self.sprite is not None:
+            self.sprite.visible = False
+
+    def delete(self) -> None:
+        if self.sprite is not None:
+            self.sprite.delete()
+            self.sprite = None
+
+    def deactivate(self):
+        self.active = False
+
+    def is_out_of_bounds(self, width: int, height: int, margin: int = 0) -> bool:
+        return (
+            self.x < -margin
+            or self.x > width + margin
+            or self.y < -margin
+            or self.y > height + margin
+        )
+
+    def update(self, dt, game:"GameEngine"):
+        if self.is_out_of_bounds(game.width,game.height):
+            self.deactivate()
+
@@ -1,12 +1,14 @@
 import math
 import random
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, List, Optional
+
+import numpy as np
 
-from entities.asteroid import Asteroid
 from entities.WeaponObject import WeaponObject
 from entities.HostileObject import HostileObject
 if TYPE_CHECKING:
-    from main import GameWindow
+    from engine import GameEngine
+    from entityindex import Handle
 
 
 class TrackingMissile(WeaponObject):
@@ -17,37 +19,71 @@ class TrackingMissile(WeaponObject):
 
         # FOV settings
         self.fov = 40
-        self.target: Asteroid = None
-
-    def find_target_in_fov(self, game: "GameWindow"):
-        """Scans asteroids and returns a random one within the 20-degree FOV."""
-        possible_targets = []
-
-        for candidate in game.entities:
-            if not (candidate.active and isinstance(candidate, HostileObject)):
-                continue
-
-            dx = candidate.x - self.x
-            dy = candidate.y - self.y
-            angle_to_asteroid = math.degrees(math.atan2(dx, dy))
-
-            diff = (angle_to_asteroid - self.rotation + 180) % 360 - 180
-
-            if abs(diff) <= self.fov / 2:
-                possible_targets.append(candidate)
-
-        if possible_targets:
-            return random.choice(possible_targets)
-        return None
-
-    def track_target(self, dt, game: "GameWindow"):
-        if not self.target or not self.target.active:
-            self.target = self.find_target_in_fov(game)
-            if not self.target:
-                return
-
-        dx = self.target.x - self.x
-        dy = self.target.y - self.y
+        self.target: Optional["Handle"] = None
+
+    @staticmethod
+    def find_targets_in_fov(missiles: List["TrackingMissile"], game: "GameEngine") -> List[Optional[HostileObject]]:
+        """Picks a random live hostile inside each missile's FOV, for all missiles in one NumPy pass.
+
+        Args:
+            missiles (List[TrackingMissile]): the missiles looking for a target
+            game (GameEngine): the engine holding the hostiles
+
+        Returns:
+            List[Optional[HostileObject]]: a target or None per missile, in the same order.
+        """
+        hostiles = [hostile for hostile in game.entities.hostiles if hostile.active]
+        if not missiles or not hostiles:
+            return [None] * len(missiles)
+
+        hx = np.fromiter((hostile.x for hostile in hostiles), dtype=np.float64, count=len(hostiles))
+        hy = np.fromiter((hostile.y for hostile in hostiles), dtype=np.float64, count=len(hostiles))
+        mx = np.fromiter((missile.x for missile in missiles), dtype=np.float64, count=len(missiles))
+        my = np.fromiter((missile.y for missile in missiles), dtype=np.float64, count=len(missiles))
+        rotation = np.fromiter((missile.rotation for missile in missiles), dtype=np.float64, count=len(missiles))
+        half_fov = np.fromiter((missile.fov / 2 for missile in missiles), dtype=np.float64, count=len(missiles))
+
+        # (missiles, hostiles) angle from each missile's heading to each hostile
+        angle = np.degrees(np.arctan2(hx[None, :] - mx[:, None], hy[None, :] - my[:, None]))
+        diff = (angle - rotation[:, None] + 180) % 360 - 180
+        in_fov = np.abs(diff) <= half_fov[:, None]
+
+        targets = []
+        for row in in_fov:
+            candidates = np.flatnonzero(row).tolist()
+            targets.append(hostiles[random.choice(candidates)] if candidates else None)
+        return targets
+
+    @staticmethod
+    def acquire_targets(game: "GameEngine") -> None:
+        """Gives every missile without a live target a new one, called once per tick by the engine."""
+        searching = [
+            weapon for weapon in game.entities.weapons
+            if weapon.active and isinstance(weapon, TrackingMissile) and weapon.current_target(game) is None
+        ]
+        if searching:
+            for missile, target in zip(searching, TrackingMissile.find_targets_in_fov(searching, game)):
+                missile.target = target.handle if target is not None else None
+
+    def current_target(self, game: "GameEngine") -> Optional[HostileObject]:
+        """The hostile being tracked, or None if it was destroyed (even if its object got pooled and reused)."""
+        target = game.entities.get(self.target)
+        if target is None or not target.active:
+            return None
+        return target
+
+    def find_target_in_fov(self, game: "GameEngine"):
+        """Returns a random live hostile within the missile's FOV, or None."""
+        return self.find_targets_in_fov([self], game)[0]
+
+    def track_target(self, dt, game: "GameEngine"):
+        # Targets are handed out in bulk by acquire_targets before the update
+        target = self.current_target(game)
+        if target is None:
+            return
+
+        dx = target.x - self.x
+        dy = target.y - self.y
         target_angle = math.degrees(math.atan2(dx, dy))
 
         angle_diff = (target_angle - self.rotation + 180) % 360 - 180
@@ -56,7 +92,7 @@ class TrackingMissile(WeaponObject):
         self.rotation += angle_diff * (turn_speed * dt)
         self.rotation %= 360
 
-    def update(self, dt, game: "GameWindow"):
+    def update(self, dt, game: "GameEngine"):
         self.track_target(dt, game)
 
         rads = math.radians(self.rotation)
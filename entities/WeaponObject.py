@@ -5,7 +5,7 @@ from typing import TYPE_CHECKING
 from entities.GameObject import GameObject
 
 if TYPE_CHECKING:
-    from main import GameWindow
+    from engine import GameEngine
 
 
 class WeaponObject(GameObject):
@@ -16,5 +16,5 @@ class WeaponObject(GameObject):
         self.rotation = rotation
         self.speed = speed
 
-    def update(self, dt: float, game: "GameWindow"):
+    def update(self, dt: float, game: "GameEngine"):
         raise NotImplementedError
@@ -1,12 +1,12 @@
 import math
 import random
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 from entities.GameObject import GameObject
 from entities.HostileObject import HostileObject
 
 if TYPE_CHECKING:
-    from main import GameWindow
+    from pool import ObjectPool
 
 
 class Asteroid(HostileObject):
@@ -18,19 +18,13 @@ class Asteroid(HostileObject):
         self.vel_x = speed_x
         self.vel_y = speed_y
 
-    def update(self, dt, game: "GameWindow"):
-        self.x += self.vel_x * dt
-        self.y += self.vel_y * dt
-        self.rotation += self.rotation_speed * dt
-
-        if self.is_out_of_bounds(game.width, game.height, margin=50):
-            self.deactivate()
-
-    def explode(self):
+    def explode(self, pool: Optional["ObjectPool"] = None):
+        """Deactivates the asteroid and returns its fragments, recycled from `pool` when given."""
         self.deactivate()
         if self.type_val <= 1:
             return []
 
+        make = pool.acquire if pool is not None else (lambda cls, **kwargs: cls(**kwargs))
         fragments = []
         num_frags = random.randint(2, 4)
         for _ in range(num_frags):
@@ -40,7 +34,8 @@ class Asteroid(HostileObject):
             new_vx = math.sin(angle_var) * speed_base
             new_vy = math.cos(angle_var) * speed_base
 
-            frag = Asteroid(
+            frag = make(
+                Asteroid,
                 img=self.image,
                 batch=self.batch,
                 x=self.x,
@@ -1,31 +1,37 @@
 import math
-import pyglet
 
 from entities.GameObject import GameObject
 
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
-    from main import GameWindow
+    from engine import GameEngine
 
 class Player(GameObject):
     def __init__(self, img, x, y, batch):
         super().__init__(img, x=x, y=y, batch=batch)
         self.scale = 0.1
+        self.drag = 0.95  # Physics drag
+        self.reset(x, y)
+
+    def reset(self, x, y):
+        """Puts the ship back in its starting state, everything the simulation reads included."""
+        self.x, self.y = x, y
+        self.rotation = 0.0
         self.velocity_x = 0
         self.velocity_y = 0
-        self.drag = 0.95  # Physics drag
-        self.accel = 20.0  # Acceleration speed
+        self.accel = 20.0  # Acceleration speed, raised by the speed power-up
         self.is_vulnerable = True
+        self.prev_x = self.prev_y = self.prev_rotation = None
 
     def apply_drag(self):
         self.velocity_x *= self.drag
         self.velocity_y *= self.drag
 
-    def update(self, dt, game: "GameWindow"):
+    def update(self, dt, game: "GameEngine"):
         # 1. Rotation (Smooth LERP to mouse)
-        dx = game.mouse_x - self.x
-        dy = game.mouse_y - self.y
+        dx = game.inputs.aim_x - self.x
+        dy = game.inputs.aim_y - self.y
 
         # Calculate target angle (Pyglet uses clockwise degrees)
         target_angle = -math.degrees(math.atan2(dy, dx)) + 90
@@ -41,13 +47,13 @@ class Player(GameObject):
         self.rotation %= 360
 
         # 2. Movement (WASD)
-        if game.keys[pyglet.window.key.W]:
+        if game.inputs.up:
             self.velocity_y += self.accel
-        if game.keys[pyglet.window.key.S]:
+        if game.inputs.down:
             self.velocity_y -= self.accel
-        if game.keys[pyglet.window.key.A]:
+        if game.inputs.left:
             self.velocity_x -= self.accel
-        if game.keys[pyglet.window.key.D]:
+        if game.inputs.right:
             self.velocity_x += self.accel
 
         self.apply_drag()
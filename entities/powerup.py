@@ -4,7 +4,7 @@ from typing import TYPE_CHECKING
 from entities.GameObject import GameObject
 
 if TYPE_CHECKING:
-    from main import GameWindow
+    from engine import GameEngine
 
 
 class PowerUp(GameObject):
@@ -28,7 +28,7 @@ class PowerUp(GameObject):
         if self.y < -50:
             self.deactivate()
 
-    def apply(self, game: "GameWindow"):
+    def apply(self, game: "GameEngine"):
         self.deactivate()
         match self.ptype:
             case "life":
@@ -39,16 +39,20 @@ class PowerUp(GameObject):
                 game.player.accel = min(30, game.player.accel + 5)
             case "fastfire":
                 game.fire_rate = 0.05
-
-                last_entry = game.Scheduler.cancel_schedule(self.stopfastfire)
-                time = (last_entry[2] if last_entry else 0) + 10 * 60
-                game.Scheduler.schedule_update(self.stopfastfire, time, (game,))
+                self.extend_timer(game, "fastfire", self.stopfastfire)
             case "splitfire":
                 game.split_fire = True
+                self.extend_timer(game, "splitfire", self.stopsplitfire)
 
-                last_entry = game.Scheduler.cancel_schedule(self.stopsplitfire)
-                time = (last_entry[2] if last_entry else 0) + 10 * 60
-                game.Scheduler.schedule_update(self.stopsplitfire, time, (game,))
+    @staticmethod
+    def extend_timer(game: "GameEngine", name: str, stop):
+        """Stacks another 10 seconds onto a timed power-up, reusing the time left on the running one."""
+        task = game.powerup_timers.get(name)
+        time_left = 0
+        if task is not None:
+            time_left = task.remaining()
+            task.cancel()
+        game.powerup_timers[name] = game.Scheduler.schedule_update(stop, time_left + 10 * 60, (game,))
 
     @staticmethod
     def stopfastfire(game):
@@ -0,0 +1,110 @@
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+from entities.GameObject import GameObject
+from entities.HostileObject import HostileObject
+from entities.WeaponObject import WeaponObject
+from entities.powerup import PowerUp
+from entities.explosion import Explosion
+
+
+class Handle(NamedTuple):
+    """Weak reference to an entity: its slot in the EntityIndex and the slot's generation at the time."""
+    slot: int
+    generation: int
+
+
+class EntityIndex:
+    """The live entities, plus one view per role kept up to date on add and remove.
+
+    Everything is stored in insertion-ordered dicts, so iteration order is the
+    order entities were added in (the simulation stays deterministic) while
+    removal is O(1).
+
+    It is also a slot map: every entity gets a Handle on add. Removing it bumps
+    the slot's generation, so handles held by missiles or scheduled callbacks
+    go stale in O(1), even if the pool hands the same object out again.
+    """
+
+    # role name -> base class, checked in this order
+    ROLES = (
+        ("hostiles", HostileObject),
+        ("weapons", WeaponObject),
+        ("powerups", PowerUp),
+        ("effects", Explosion),
+    )
+
+    def __init__(self) -> None:
+        self._all: Dict[GameObject, None] = {}
+        self.hostiles: Dict[HostileObject, None] = {}
+        self.weapons: Dict[WeaponObject, None] = {}
+        self.powerups: Dict[PowerUp, None] = {}
+        self.effects: Dict[Explosion, None] = {}
+        # Each concrete type resolves its role once
+        self._role_of: Dict[type, Optional[dict]] = {}
+
+        # Slot map
+        self._slots: List[Optional[GameObject]] = []
+        self._generations: List[int] = []
+        self._free_slots: List[int] = []
+
+    def __iter__(self) -> Iterator[GameObject]:
+        return iter(self._all)
+
+    def __len__(self) -> int:
+        return len(self._all)
+
+    def __contains__(self, entity) -> bool:
+        return entity in self._all
+
+    def _role(self, cls: type) -> Optional[dict]:
+        try:
+            return self._role_of[cls]
+        except KeyError:
+            role = next((getattr(self, name) for name, base in self.ROLES if issubclass(cls, base)), None)
+            self._role_of[cls] = role
+            return role
+
+    def add(self, entity: GameObject) -> Handle:
+        self._all[entity] = None
+        role = self._role(type(entity))
+        if role is not None:
+            role[entity] = None
+
+        if self._free_slots:
+            slot = self._free_slots.pop()
+            self._slots[slot] = entity
+        else:
+            slot = len(self._slots)
+            self._slots.append(entity)
+            self._generations.append(0)
+        entity.handle = Handle(slot, self._generations[slot])
+        return entity.handle
+
+    def remove(self, entity: GameObject) -> None:
+        del self._all[entity]
+        role = self._role(type(entity))
+        if role is not None:
+            del role[entity]
+
+        slot = entity.handle.slot
+        self._slots[slot] = None
+        self._generations[slot] += 1
+        self._free_slots.append(slot)
+        entity.handle = None
+
+    def get(self, handle: Optional[Handle]) -> Optional[GameObject]:
+        """Returns the entity a handle refers to, or None once it was removed."""
+        if handle is None or self._generations[handle.slot] != handle.generation:
+            return None
+        return self._slots[handle.slot]
+
+    def clear(self) -> None:
+        for entity in self._all:
+            self._generations[entity.handle.slot] += 1
+            entity.handle = None
+        self._all.clear()
+        for name, _ in self.ROLES:
+            getattr(self, name).clear()
+        self._slots = [None] * len(self._slots)
+        # Lowest slots first so a fresh game reuses them in order
+        self._free_slots = list(reversed(range(len(self._slots))))
@@ -1,4 +1,7 @@
 import os
+import threading
+import time
+from typing import Optional
 
 def get_high_score_path(filename="highscore.txt"):
     # Store file in a writable folder with same filename
@@ -12,11 +15,117 @@ def load_high_score(filename="highscore.txt"):
         try:
             with open(path, "r") as f:
                 return int(f.read().strip() or 0)
-        except:
+        except (OSError, ValueError):
             return 0
     return 0
 
 def save_high_score(newHigh, filename="highscore.txt"):
     path = get_high_score_path(filename)
-    with open(path, "w") as f:
-        f.write(str(newHigh))
\ No newline at end of file
+    # Write next to the real file and swap it in, so a crash leaves either the old or the new score
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        f.write(str(newHigh))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class HighScoreStore:
+    """The high score kept in memory and written behind on a background thread.
+
+    set() is cheap enough to call every tick. The first change after a write
+    schedules the next one `debounce` seconds later, so a long record run
+    touches the disk at most once per `debounce` seconds. flush() writes the
+    latest value right away (game over), close() does the same and waits for
+    it (window closed).
+    """
+
+    def __init__(self, filename: str = "highscore.txt", debounce: float = 2.0) -> None:
+        self.filename = filename
+        self.debounce = debounce
+        self.value = load_high_score(filename)
+        self.saved = self.value
+        self.writes = 0
+        self._due: Optional[float] = None  # time.monotonic() of the next write, None when clean
+        self._flush = False  # flush() asked for a write that must not wait for the debounce
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def set(self, value: int) -> None:
+        if value == self.value:
+            return
+        with self._cond:
+            self.value = value
+            if self._due is None:
+                self._due = time.monotonic() + self.debounce
+                self._start()
+                self._cond.notify()
+
+    def flush(self, wait: bool = False) -> None:
+        """Writes the current value now instead of after the debounce.
+
+        Args:
+            wait (bool): block until it is on disk
+        """
+        with self._cond:
+            if self.value != self.saved:
+                self._due = time.monotonic()
+                self._flush = True
+                self._start()
+                self._cond.notify()
+            if wait:
+                self._cond.wait_for(lambda: self._due is None or self._closed, timeout=5.0)
+
+    def close(self) -> None:
+        self.flush(wait=True)
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+            self._thread = None
+
+    def _start(self) -> None:
+        # Called with the lock held
+        if self._thread is None and not self._closed:
+            self._thread = threading.Thread(target=self._run, name="highscore-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        with self._cond:
+            while True:
+                if self._due is None:
+                    if self._closed:
+                        return
+                    self._cond.wait()
+                    continue
+                delay = self._due - time.monotonic()
+                if delay > 0:
+                    self._cond.wait(delay)
+                    continue
+
+                value = self.value
+                self._flush = False
+                self._cond.release()
+                try:
+                    save_high_score(value, self.filename)
+                    error = None
+                except OSError as e:
+                    error = e
+                finally:
+                    self._cond.acquire()
+
+                if error is not None:
+                    print(f"error on saving high score: {error}")
+                    # Try again later, unless we are shutting down
+                    self._due = None if self._closed else time.monotonic() + self.debounce
+                else:
+                    self.saved = value
+                    self.writes += 1
+                    if self.value == value:
+                        self._due = None
+                    elif not self._flush:
+                        # Changed while writing, the next write waits a full debounce again
+                        self._due = time.monotonic() + self.debounce
+                self._cond.notify_all()
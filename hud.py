@@ -0,0 +1,200 @@
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pyglet
+from pyglet import shapes
+
+DIGITS = "0123456789"
+
+
+class DigitStrip:
+    """The ten digits of one font rendered once into a single texture, one fixed-width cell each.
+
+    Font glyph textures only carry coverage in their alpha channel (the text
+    shader supplies the colour), so the glyphs are copied into a white RGBA
+    strip that the normal sprite shader can draw.
+    """
+
+    def __init__(self, font_name: Optional[str], font_size: int, bold: bool) -> None:
+        font = pyglet.font.load(font_name, font_size, bold=bold)
+        glyphs = font.get_glyphs(DIGITS)
+        self.cell = max(glyph.advance for glyph in glyphs)
+        self.descent = font.descent  # negative, how far below the baseline the strip starts
+        height = font.ascent - font.descent
+
+        pixels = np.zeros((height, self.cell * len(DIGITS), 4), dtype=np.uint8)
+        pixels[..., :3] = 255
+        for i, glyph in enumerate(glyphs):
+            if not glyph.width or not glyph.height:
+                continue
+            data = glyph.get_image_data().get_data("RGBA", glyph.width * 4)
+            alpha = np.frombuffer(data, dtype=np.uint8).reshape(glyph.height, glyph.width, 4)[..., 3]
+            # Some font backends (FreeType, Quartz) store glyphs top row first and swap the
+            # tex_coords to draw them upright, others (DirectWrite, GDI+) bottom row first.
+            # The bottom-left vertex sitting above the top-left one means the former.
+            if glyph.tex_coords[1] > glyph.tex_coords[10]:
+                alpha = alpha[::-1]
+            left, bottom = glyph.vertices[0], glyph.vertices[1] - self.descent
+            # Clip, a bearing can stick out of the cell by a pixel
+            x0, y0 = max(left, 0), max(bottom, 0)
+            x1, y1 = min(left + glyph.width, self.cell), min(bottom + glyph.height, height)
+            pixels[y0:y1, i * self.cell + x0:i * self.cell + x1, 3] = alpha[y0 - bottom:y1 - bottom, x0 - left:x1 - left]
+
+        self.texture = pyglet.image.ImageData(pixels.shape[1], height, "RGBA", pixels.tobytes()).get_texture()
+        self.digits = [self.texture.get_region(i * self.cell, 0, self.cell, height) for i in range(len(DIGITS))]
+
+
+_strips: Dict[Tuple[Optional[str], int, bool], DigitStrip] = {}
+
+
+def digit_strip(font_name: Optional[str] = None, font_size: int = 12, bold: bool = False) -> DigitStrip:
+    """Returns the cached DigitStrip for a font, building it on first use."""
+    key = (font_name, font_size, bold)
+    strip = _strips.get(key)
+    if strip is None:
+        strip = _strips[key] = DigitStrip(font_name, font_size, bold)
+    return strip
+
+
+class TextField:
+    """A Label whose text is only set, and so laid out again, when its value changes."""
+
+    def __init__(self, template: str, value, x: int, y: int, batch, **label_kwargs) -> None:
+        self.template = template
+        self.value = value
+        self.label = pyglet.text.Label(template.format(value), x=x, y=y, batch=batch, **label_kwargs)
+        self.relayouts = 0
+
+    def set(self, value) -> bool:
+        if value == self.value:
+            return False
+        self.value = value
+        self.label.text = self.template.format(value)
+        self.relayouts += 1
+        return True
+
+
+class NumberField:
+    """A caption Label laid out once, followed by one sprite per digit.
+
+    A new value only swaps the texture region of the digits that differ, which
+    rewrites their texture coordinates and nothing else.
+    """
+
+    def __init__(self, caption: str, value: int, x: int, y: int, batch,
+                 font_size: int = 12, bold: bool = False, digits: int = 7) -> None:
+        self.label = pyglet.text.Label(caption, x=x, y=y, batch=batch, font_size=font_size, bold=bold)
+        self.strip = digit_strip(None, font_size, bold)
+        self.batch = batch
+        font = pyglet.font.load(None, font_size, bold=bold)
+        self.x = x + sum(glyph.advance for glyph in font.get_glyphs(caption))
+        self.y = y + self.strip.descent
+        self.sprites: List[pyglet.sprite.Sprite] = []
+        self.text = ""
+        self.value = None
+        self.digit_updates = 0
+        self._grow(digits)
+        self.set(value)
+
+    def _grow(self, count: int) -> None:
+        while len(self.sprites) < count:
+            sprite = pyglet.sprite.Sprite(self.strip.digits[0], self.x + len(self.sprites) * self.strip.cell, self.y, batch=self.batch)
+            sprite.visible = False
+            self.sprites.append(sprite)
+
+    def set(self, value: int) -> bool:
+        if value == self.value:
+            return False
+        self.value = value
+        text = str(max(value, 0))
+        self._grow(len(text))
+        old = self.text
+        for i, sprite in enumerate(self.sprites):
+            if i < len(text):
+                if i >= len(old) or old[i] != text[i]:
+                    sprite.image = self.strip.digits[ord(text[i]) - 48]
+                    self.digit_updates += 1
+                if i >= len(old):
+                    sprite.visible = True
+            elif i < len(old):
+                sprite.visible = False
+        self.text = text
+        return True
+
+
+class HUD:
+    """Score, lives, high score and weapon in the top left corner.
+
+    update() compares against the last values it showed, so a tick where
+    nothing changed touches no vertex data at all.
+    """
+
+    def __init__(self, engine, top: int, batch) -> None:
+        self.score = NumberField("Score: ", engine.score, 10, top - 30, batch, font_size=14, bold=True)
+        self.lives = NumberField("Lives: ", engine.lives, 10, top - 55, batch, font_size=14, bold=True, digits=2)
+        self.high = NumberField("High Score: ", engine.high_score, 10, top - 80, batch, font_size=12)
+        self.weapon = TextField("Current Weapon: {}", engine.weapon.value, 10, top - 105, batch, font_size=12)
+
+    def update(self, engine) -> None:
+        self.score.set(engine.score)
+        self.lives.set(engine.lives)
+        self.high.set(engine.high_score)
+        self.weapon.set(engine.weapon.value)
+
+    def summary(self) -> str:
+        digits = self.score.digit_updates + self.lives.digit_updates + self.high.digit_updates
+        return f"HUD: {digits} digit swaps, {self.weapon.relayouts} relayouts"
+
+
+class FrameTimeGraph:
+    """Frame times as bars with a line at the frame budget, drawn with batched shapes.
+
+    It sweeps left to right like an oscilloscope: push() only moves the one
+    bar under the cursor, so the cost per frame does not depend on how many
+    bars are shown.
+    """
+
+    OK = (80, 200, 120, 255)
+    OVER = (230, 70, 60, 255)
+
+    def __init__(self, x: int, y: int, width: int, height: int, batch,
+                 budget: float = 1 / 60, samples: int = 120) -> None:
+        self.height = height
+        self.budget = budget
+        self.scale = 2 * budget  # top of the graph
+        self.cursor = 0
+        background, foreground = pyglet.graphics.Group(order=0), pyglet.graphics.Group(order=1)
+
+        self.background = shapes.Rectangle(x, y, width, height, color=(0, 0, 0, 160), batch=batch, group=background)
+        bar_width = width / samples
+        self.bars = [
+            shapes.Rectangle(x + i * bar_width, y, max(bar_width - 1, 1), 0, color=self.OK, batch=batch, group=foreground)
+            for i in range(samples)
+        ]
+        line_y = y + height * budget / self.scale
+        self.budget_line = shapes.Line(x, line_y, x + width, line_y, color=(255, 255, 255, 200), batch=batch, group=foreground)
+        self._shapes = [self.background, self.budget_line, *self.bars]
+
+    def push(self, seconds: float) -> None:
+        bar = self.bars[self.cursor]
+        bar.height = self.height * min(seconds / self.scale, 1.0)
+        bar.color = self.OVER if seconds > self.budget else self.OK
+        self.cursor = (self.cursor + 1) % len(self.bars)
+
+    def fill(self, history) -> None:
+        """Redraws every bar from `history` (oldest first), e.g. when the graph is shown again."""
+        values = history[-len(self.bars):]
+        self.cursor = 0
+        for seconds in values:
+            self.push(float(seconds))
+        for bar in self.bars[len(values):]:
+            bar.height = 0
+
+    @property
+    def visible(self) -> bool:
+        return self.background.visible
+
+    @visible.setter
+    def visible(self, visible: bool) -> None:
+        for shape in self._shapes:
+            shape.visible = visible
@@ -0,0 +1,115 @@
+from typing import List
+
+import numpy as np
+
+
+class KinematicsStore:
+    """Struct-of-arrays storage for entities that move in a straight line.
+
+    Position, velocity, rotation and rotation speed live in contiguous NumPy
+    arrays so every entity is integrated in one vectorized step. Results are
+    written back to the entities in bulk; the sprite views are only touched when
+    the renderer syncs them.
+    """
+
+    # hostile is 1.0 for HostileObjects, so they can be sliced out without a Python loop
+    _fields = ("x", "y", "vel_x", "vel_y", "rotation", "rotation_speed", "margin", "hostile")
+
+    def __init__(self, capacity: int = 256) -> None:
+        self.count = 0
+        self.entities: List = []
+        self._allocate(capacity)
+
+    def _allocate(self, capacity: int) -> None:
+        for name in self._fields:
+            new = np.zeros(capacity, dtype=np.float64)
+            old = getattr(self, name, None)
+            if old is not None:
+                new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    @property
+    def capacity(self) -> int:
+        return len(self.x)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, entity) -> bool:
+        slot = getattr(entity, "kinematics_slot", None)
+        return slot is not None and slot < self.count and self.entities[slot] is entity
+
+    def add(self, entity) -> None:
+        """Copies the entity's motion into the arrays; the store owns it from now on."""
+        if self.count == self.capacity:
+            self._allocate(self.capacity * 2)
+        i = self.count
+        self.x[i] = entity.x
+        self.y[i] = entity.y
+        self.vel_x[i] = entity.vel_x
+        self.vel_y[i] = entity.vel_y
+        self.rotation[i] = entity.rotation
+        self.rotation_speed[i] = getattr(entity, "rotation_speed", 0.0)
+        self.margin[i] = entity.bounds_margin
+        self.hostile[i] = entity.hostile
+        self.entities.append(entity)
+        entity.kinematics_slot = i
+        self.count += 1
+
+    def remove(self, entity) -> None:
+        """Swap-removes an entity, moving the last slot into the freed one."""
+        if entity not in self:
+            return
+        i = entity.kinematics_slot
+        last = self.count - 1
+        if i != last:
+            for name in self._fields:
+                array = getattr(self, name)
+                array[i] = array[last]
+            moved = self.entities[last]
+            self.entities[i] = moved
+            moved.kinematics_slot = i
+        self.entities.pop()
+        entity.kinematics_slot = None
+        self.count -= 1
+
+    def clear(self) -> None:
+        for entity in self.entities:
+            entity.kinematics_slot = None
+        self.entities.clear()
+        self.count = 0
+
+    def hostiles(self) -> np.ndarray:
+        """(n, 4) x, y, vel_x, vel_y of every hostile in the store, in slot order."""
+        n = self.count
+        mask = self.hostile[:n] != 0
+        return np.column_stack((self.x[:n][mask], self.y[:n][mask], self.vel_x[:n][mask], self.vel_y[:n][mask]))
+
+    def integrate(self, dt: float) -> None:
+        n = self.count
+        self.x[:n] += self.vel_x[:n] * dt
+        self.y[:n] += self.vel_y[:n] * dt
+        self.rotation[:n] += self.rotation_speed[:n] * dt
+
+    def out_of_bounds(self, width: int, height: int) -> np.ndarray:
+        """Returns a boolean mask of the slots outside the play area (plus their margin)."""
+        n = self.count
+        x, y, margin = self.x[:n], self.y[:n], self.margin[:n]
+        return (x < -margin) | (x > width + margin) | (y < -margin) | (y > height + margin)
+
+    def push(self) -> None:
+        """Writes positions and rotations back to the entities."""
+        n = self.count
+        for entity, x, y, rotation in zip(
+            self.entities, self.x[:n].tolist(), self.y[:n].tolist(), self.rotation[:n].tolist()
+        ):
+            entity.x = x
+            entity.y = y
+            entity.rotation = rotation
+
+    def step(self, dt: float, width: int, height: int) -> None:
+        """Integrates every entity, deactivates the ones that left the screen and pushes the results."""
+        self.integrate(dt)
+        for slot in np.flatnonzero(self.out_of_bounds(width, height)).tolist():
+            self.entities[slot].deactivate()
+        self.push()
@@ -1,34 +1,22 @@
+import argparse
 import pyglet
 import os
-import random
-import numpy as np
 import time
-import psutil
-from typing import List, Union
-
-from entities.player import Player
-from entities.laser import Laser
-from entities.asteroid import Asteroid
-from entities.explosion import Explosion
-from entities.powerup import PowerUp
-from entities.TrackingMissile import TrackingMissile
-from entities.GameObject import GameObject
-from entities.HostileObject import HostileObject
-from entities.WeaponObject import WeaponObject
-from highscore import load_high_score, save_high_score
+
+from engine import GameEngine, InputState, WIDTH, HEIGHT, FIXED_DT
 from resources import resource_manager
 from gamestate import game_state
-from utils import are_sprites_colliding
 from Weapons import WeaponType
-from Scheduler import scheduler
-
-import tracemalloc
+from highscore import get_high_score_path
+from replay import ReplayRecorder
+from timing import StatsCollector
+from audio import VoiceManager
+from hud import HUD, FrameTimeGraph
+from bots import BOTS, make_bot
+from memprofile import MemoryProfiler, memory_tracing_requested
 
-tracemalloc.start()
-
-# Constants
-WIDTH, HEIGHT = 800, 600
-FIXED_DT = 1 / 60.0
+# Most ticks run per frame to catch up after a stall, the rest of the backlog is dropped
+MAX_CATCH_UP_STEPS = 5
 
 base_dir = os.path.dirname(__file__)
 
@@ -37,116 +25,113 @@ _rm = resource_manager(base_dir)
 registry = _rm.load_resources()
 
 class GameWindow(pyglet.window.Window):
-    def __init__(self):
+    """Renderer and input adapter on top of the headless GameEngine."""
+
+    def __init__(self, timings_path: str = None, memory_path: str = None, memory_interval: float = 0, bot: str = "dodge"):
         super().__init__(width=WIDTH, height=HEIGHT, caption="Astro Shooter", resizable=False)
         self.batch = pyglet.graphics.Batch()
-        
+
         # Input
         self.keys = pyglet.window.key.KeyStateHandler()
         self.push_handlers(self.keys)
         self.mouse_x = WIDTH // 2
         self.mouse_y = HEIGHT // 2
-        
+        self.is_firing = False
+        self.pending_weapon = -1
+
         # Registry
         self.registry = registry
-        
+
         # Cursor
         cursor = pyglet.window.ImageMouseCursor(self.registry.sprite("cursor"), 0, 0)
         self.set_mouse_cursor(cursor)
 
-        # Game Objects
-        self.player = Player(self.registry.sprite("player"), WIDTH//2, HEIGHT//2, self.batch)
-        self.entities: List[GameObject] = []
-
-        # State
-        self.score = 0
-        self.lives = 3
-        self.high_score = load_high_score()
-        self.game_state = game_state.Menu
-        
-        # Scheduler
-        self.Scheduler: scheduler = scheduler()
-        
-        # Shooting
-        self.is_firing = False
-        self.fire_cooldown = 0
-        self.fire_rate = 0.15  # Base fire rate
-        self.unlocked_weapon = [WeaponType.laser]
-        self.weapon = WeaponType.laser
-        self.split_fire = False
-        
-        # Spawning
-        self.asteroid_spawn_rate = 2  # % chance per frame
-        
+        # Simulation, every game is recorded so a reported slow frame can be replayed
+        # The bot plays while auto mode is on (P, then O)
+        self.bot_name = bot
+        self.engine = GameEngine(self.registry, WIDTH, HEIGHT, batch=self.batch, bot=make_bot(bot))
+        if timings_path:
+            self.engine.timings.stream(timings_path)
+
+        # Memory tracing is opt-in, tracemalloc slows down every allocation
+        self.memory: MemoryProfiler = None
+        if memory_path:
+            self.memory = MemoryProfiler(self.engine, memory_path)
+            print(f"Memory tracing enabled, press M for a snapshot diff, reports go to {memory_path}")
+            if memory_interval > 0:
+                pyglet.clock.schedule_interval(lambda dt: self.memory_snapshot(), memory_interval)
+        self.recorder: ReplayRecorder = None
+        # Sound effects share a fixed pool of players
+        self.voices = VoiceManager(self.registry.sounds)
+        self.engine.push_handlers(
+            on_sound=self.voices.play,
+            on_weapon_unlocked=self.on_weapon_unlocked,
+            on_game_over=self.on_game_over,
+        )
+
         # Audio
         self.bg_player = self.registry.sound("music")
         self.bg_player.play()
         self.bg_player.loop = True
         self.bg_player.volume = 0.3
-        
+
         # Debug
         self.debug = False
-        self.tps = 1/FIXED_DT
+        self.stats = StatsCollector(120)  # last 2 seconds, so FPS/TPS don't jump around
         self.last_time_fps = time.perf_counter()
-        self.msize: int = 0
-        self.fps = 0
-        self.auto = False
         # UI
-        self.lbl_score = pyglet.text.Label("Score: 0", x=10, y=HEIGHT-30, batch=self.batch, font_size=14, bold=True)
-        self.lbl_lives = pyglet.text.Label("Lives: 3", x=10, y=HEIGHT-55, batch=self.batch, font_size=14, bold=True)
-        self.lbl_high = pyglet.text.Label(f"High Score: {self.high_score}", x=10, y=HEIGHT-80, batch=self.batch, font_size=12)
-        self.lbl_weapon = pyglet.text.Label(f"Current Weapon: {self.weapon.value}", x=10, y=HEIGHT-105, batch=self.batch, font_size=12)
-        self.lbl_debug = pyglet.text.Label("", x=WIDTH-10, y=HEIGHT-30, batch=self.batch, font_size=12, anchor_x='right', multiline=True, width=200)
+        self.hud = HUD(self.engine, HEIGHT, self.batch)
+        self.lbl_debug = pyglet.text.Label("", x=WIDTH-10, y=HEIGHT-30, batch=self.batch, font_size=12, anchor_x='right', multiline=True, width=320)
         self.lbl_debug.visible = self.debug
-        self.lbl_center = pyglet.text.Label("ASTRO SHOOTER\n\nPRESS ENTER TO START", 
-                                            x=WIDTH//2, y=HEIGHT//2, 
-                                            anchor_x='center', anchor_y='center', 
+        self.frame_graph = FrameTimeGraph(WIDTH-250, 10, 240, 80, self.batch, budget=FIXED_DT)
+        self.frame_graph.visible = self.debug
+        self.lbl_center = pyglet.text.Label("ASTRO SHOOTER\n\nPRESS ENTER TO START",
+                                            x=WIDTH//2, y=HEIGHT//2,
+                                            anchor_x='center', anchor_y='center',
                                             batch=self.batch, font_size=20, bold=True,
                                             multiline=True, width=400, align='center')
-        
-        
-        pyglet.clock.schedule_interval(self.update, FIXED_DT)
+
+
+        # Fixed timestep: real time piles up here and is simulated in FIXED_DT steps
+        self.accumulator = 0.0
+        pyglet.clock.schedule(self.update)
         pyglet.clock.schedule_interval(self.update_debug, 1/2)  # Update debug info every second
-        
+
     def update_debug(self, dt):
         # Place to update any debug info that doesn't need to be updated every frame
-        self.msize = psutil.Process(os.getpid()).memory_info().rss
+        self.stats.sample()
+        if not self.debug:
+            return
+        stats = "\n        ".join(self.stats.summary())  # avg/p99/max over the last 2 seconds
+        pool_stats = "\n        ".join(self.engine.pool.summary())  # hits/misses per entity type
+        phase_stats = "\n        ".join(self.engine.timings.summary())  # min/avg/p99 per tick phase
         self.lbl_debug.text = f"""
-        FPS: {self.fps:.2f}
-        TPS: {self.tps:.2f}
-        Entities: {len(self.entities)}
-        Spawn Rate: {self.asteroid_spawn_rate:.2f}
-        Memory Usage: {self.msize/(2**20):.2f} MiB
+        {stats}
+        Spawn Rate: {self.engine.asteroid_spawn_rate:.2f}
+        {pool_stats}
+        {self.voices.summary()}
+        {self.hud.summary()}
+        {phase_stats}
+        {self.memory.status() if self.memory else ""}
         """
-    
+
+    def save_replay(self):
+        if self.recorder is not None:
+            self.recorder.save(get_high_score_path("last.replay"), self.engine)
+            self.recorder = None
+
     def on_close(self):
-        snapshot = tracemalloc.take_snapshot()
-        top_stats = snapshot.statistics('lineno')
-        print("[ Top 100 memory allocations ]")
-        for stat in top_stats[:100]:
-            print(stat)
+        if self.engine.game_state in (game_state.Playing, game_state.Paused):
+            self.save_replay()
+        self.engine.close()
+        self.voices.delete()
+        if self.memory is not None:
+            self.memory_snapshot()
+            self.memory.stop()
         return super().on_close()
-    def reset_game(self):
-        self.score = 0
-        self.lives = 3
-        def clear_entitys(l: List):
-            for item in l:
-                item.delete()
-            l.clear()
-        clear_entitys(self.entities)
-        
-        self.player.is_vulnerable = True
-
-        self.Scheduler.cancel_all()
-        
-        self.player.x, self.player.y = WIDTH // 2, HEIGHT // 2
-        self.player.velocity_x, self.player.velocity_y = 0, 0
-        
-        self.split_fire = False
-        self.fire_rate = 0.15
-        self.asteroid_spawn_rate = 2
-        self.weapon = WeaponType.laser
-        self.unlocked_weapon = [WeaponType.laser]
+
+    def memory_snapshot(self):
+        print(self.memory.snapshot())
 
     def on_mouse_motion(self, x, y, dx, dy):
         self.mouse_x = x
@@ -157,7 +142,7 @@ class GameWindow(pyglet.window.Window):
         self.mouse_y = y
 
     def on_mouse_press(self, x, y, button, modifiers):
-        if button == pyglet.window.mouse.LEFT and self.game_state == game_state.Playing:
+        if button == pyglet.window.mouse.LEFT and self.engine.game_state == game_state.Playing:
             self.is_firing = True
 
     def on_mouse_release(self, x, y, button, modifiers):
@@ -165,236 +150,107 @@ class GameWindow(pyglet.window.Window):
             self.is_firing = False
 
     def on_key_press(self, symbol, modifiers):
+        engine = self.engine
         if symbol == pyglet.window.key.ENTER:
-            if self.game_state != game_state.Playing and self.game_state != game_state.Paused:
-                self.game_state = game_state.Playing
+            if engine.game_state != game_state.Playing and engine.game_state != game_state.Paused:
                 self.lbl_center.visible = False
-                self.reset_game()
+                engine.start()
+                self.recorder = ReplayRecorder(engine.seed, WIDTH, HEIGHT, self.bot_name)
 
         if symbol in (pyglet.window.key._1, pyglet.window.key._2):
-            if self.game_state == game_state.Playing:
-                index = symbol - pyglet.window.key._1
-                if index < len(self.unlocked_weapon):
-                    self.weapon = self.unlocked_weapon[index]
-        self.lbl_weapon.text = f"Current Weapon: {self.weapon.value}"
-        
-        if symbol == pyglet.window.key.ESCAPE and self.game_state == game_state.Playing:
-            self.game_state = game_state.Paused
+            # Applied on the next tick so the switch ends up in the replay
+            self.pending_weapon = symbol - pyglet.window.key._1
+
+        if symbol == pyglet.window.key.ESCAPE and engine.game_state == game_state.Playing:
+            engine.game_state = game_state.Paused
             self.lbl_center.text = "PAUSED\n\nPRESS ESC TO RESUME"
             self.lbl_center.visible = True
-        elif symbol == pyglet.window.key.ESCAPE and self.game_state == game_state.Paused:
-            self.game_state = game_state.Playing
+        elif symbol == pyglet.window.key.ESCAPE and engine.game_state == game_state.Paused:
+            engine.game_state = game_state.Playing
             self.lbl_center.visible = False
-        
+
         # debug
         if symbol == pyglet.window.key.P:
             self.debug = not self.debug
             if not self.debug:
-                self.auto = False
+                engine.auto = False
             self.lbl_debug.visible = self.debug
+            self.frame_graph.visible = self.debug
+            if self.debug:
+                self.frame_graph.fill(self.stats.frame_intervals.ordered())
+                self.update_debug(0)
             print(f"Debug mode {'enabled' if self.debug else 'disabled'}")
-        
+
         if symbol == pyglet.window.key.O and self.debug:
-            self.auto = not self.auto
-            print(f"Auto mode {'enabled' if self.auto else 'disabled'}")
+            engine.auto = not engine.auto
+            print(f"Auto mode {'enabled' if engine.auto else 'disabled'}")
+
+        if symbol == pyglet.window.key.M and self.memory is not None:
+            self.memory_snapshot()
+
+    def read_inputs(self) -> InputState:
+        """Snapshots the keyboard and mouse into the engine's input format."""
+        key = pyglet.window.key
+        return InputState(
+            up=self.keys[key.W],
+            down=self.keys[key.S],
+            left=self.keys[key.A],
+            right=self.keys[key.D],
+            aim_x=self.mouse_x,
+            aim_y=self.mouse_y,
+            firing=self.is_firing,
+            weapon=self.pending_weapon,
+        )
 
     def update(self, dt):
-        if self.game_state != game_state.Playing:
+        if self.engine.game_state != game_state.Playing:
+            self.accumulator = 0.0
             return
-        
-        # Update scheduler tasks
-        self.Scheduler.update_schedule(dt)
-
-        # Update Player (with bounds)
-        self.player.update(dt, self)
-        
-        # debug for memory leaks/ aim bot
-        asteroids = list(filter(lambda Entity: isinstance(Entity, Asteroid), self.entities))
-        closest_asteroid: Asteroid = min(asteroids, key=lambda a: (a.x - self.player.x)**2 + (a.y - self.player.y)**2, default=None)
-        powerups = list(filter(lambda Entity: isinstance(Entity, PowerUp), self.entities))
-        closest_powerup: PowerUp = min(powerups, key=lambda p: (p.x - self.player.x)**2 + (p.y - self.player.y)**2, default=None)
-        if self.auto:
-            # Always aim and fire at closest asteroid
-            if closest_asteroid and self.debug:
-                self.is_firing = True
-                distance = ((closest_asteroid.x - self.player.x)**2 + (closest_asteroid.y - self.player.y)**2)**0.5
-                self.mouse_x = closest_asteroid.x + closest_asteroid.vel_x * dt * distance * 0.1
-                self.mouse_y = closest_asteroid.y + closest_asteroid.vel_y * dt * distance * 0.1
-
-            DANGER_RADIUS = 120  # pixels — how close an asteroid must be before dodging
-
-            # Sum a repulsion vector from all nearby asteroids
-            avoid_x, avoid_y = 0.0, 0.0
-            for ast in self.entities:
-                dx = self.player.x - ast.x
-                dy = self.player.y - ast.y
-                dist = (dx**2 + dy**2) ** 0.5
-                if 0 < dist < DANGER_RADIUS:
-                    weight = (DANGER_RADIUS - dist) / DANGER_RADIUS  # closer = stronger push
-                    avoid_x += (dx / dist) * weight
-                    avoid_y += (dy / dist) * weight
-
-            avoiding = (avoid_x**2 + avoid_y**2) ** 0.5 > 0.1
-
-            if avoiding and self.debug:
-                # Dodge away from nearby asteroids
-                move_x = avoid_x
-                move_y = avoid_y
-            elif closest_powerup and self.debug:
-                # No danger — chase the nearest powerup
-                move_x = closest_powerup.x - self.player.x
-                move_y = closest_powerup.y - self.player.y
-            else:
-                move_x = self.width/2 - self.player.x
-                move_y = self.height/2 - self.player.y
-
-            # Convert desired direction into key presses
-            if self.debug:
 
-                self.keys.data[pyglet.window.key.A] = move_x < -0.1
-                self.keys.data[pyglet.window.key.D] = move_x > 0.1
-                self.keys.data[pyglet.window.key.S] = move_y < -0.1
-                self.keys.data[pyglet.window.key.W] = move_y > 0.1
-
-        # Update the entities
-        entities_to_append: List[GameObject] = []
-        for entity1 in self.entities:
-            entity1.update(dt, self)
-            # Player collision
-            if isinstance(entity1, HostileObject) and self.player.is_vulnerable:
-                if are_sprites_colliding(entity1, self.player):
-                    self.lives -= 1
-                    self.player.is_vulnerable = False
-                    self.Scheduler.schedule_update(
-                        lambda player: setattr(player, 'is_vulnerable', True), 5, (self.player,)
-                    )
-                    entities_to_append.append(
-                        Explosion(self.registry.sprite("explosion"), entity1.x, entity1.y, self.batch, self.Scheduler)
-                    )
-                    self.registry.play("explosion")
-                    entity1.deactivate()
-                    if self.lives <= 0:
-                        self.game_over()
-                        return
-            
-            if isinstance(entity1, PowerUp):
-                if are_sprites_colliding(entity1, self.player):
-                    entity1.apply(self)
-                    registry.play("powerup")
-                    entity1.deactivate()
-
-            # Entity collisions
-            for entity2 in self.entities:
-                if not entity2.active:
-                    continue
-                if not entity1.active:  # killed by player collision above
-                    break
-                if isinstance(entity1, HostileObject) and isinstance(entity2, WeaponObject):
-                    if are_sprites_colliding(entity1, entity2):
-                        if isinstance(entity1, Asteroid):
-                            self.score += int(100 * entity1.scale)
-                            entities_to_append.extend(entity1.explode())
-                            entity1.deactivate()
-                        entities_to_append.append(
-                            Explosion(self.registry.sprite("explosion"), entity2.x, entity2.y, self.batch, self.Scheduler)
-                        )
-                        if random.random() < 0.15:
-                            self.spawn_powerup(entity1.x, entity1.y)
-                        self.registry.play("explosion")
-                        entity2.deactivate()
-        
-        self.entities.extend(entities_to_append)
-        for entity in self.entities.copy():
-            if entity.active:
-                continue
-            self.entities.remove(entity)
-            entity.delete()
-        
-        # Game over check
-        if self.lives <= 0:
-            self.game_over()
-            
-        # Shooting
-        self.fire_cooldown -= dt
-        if self.is_firing and self.fire_cooldown <= 0:
-            self.fire_cooldown = self.fire_rate
-
-            weapon_str = self.weapon.value
-            Weapon_to_spawn = WeaponType.str_to_class(weapon_str)
-            
-            self.registry.play(weapon_str)
-            if self.split_fire:
-                self.entities.append(Weapon_to_spawn(self.registry.sprite(weapon_str), self.player.x, self.player.y, self.player.rotation - 10, self.batch))
-                self.entities.append(Weapon_to_spawn(self.registry.sprite(weapon_str), self.player.x, self.player.y, self.player.rotation + 10, self.batch))
-            self.entities.append(Weapon_to_spawn(self.registry.sprite(weapon_str), self.player.x, self.player.y, self.player.rotation, self.batch))
-
-        # Spawn Asteroids
-        if random.randrange(0, 100) < self.asteroid_spawn_rate:
-            self.spawn_asteroid()
-
-        # Update UI
-        self.lbl_score.text = f"Score: {self.score}"
-        self.lbl_lives.text = f"Lives: {self.lives}"
-        
-        if self.score > self.high_score:
-            self.high_score = self.score
-            save_high_score(self.score)
-            self.lbl_high.text = f"High Score: {self.high_score}"
-            
-        
-        # Increase difficulty
-        self.asteroid_spawn_rate = (6.69578)/(1+np.exp(-((0.000128988*self.score)-0.853516)))
-        """
-        log formula for spawn rate:
-        f(0) = 2
-        f(5000) = 3
-        f(15000) = 5
-        """
-        
-        
-        if WeaponType.tracking_missile_condition(score=self.score) and WeaponType.tracking_missile not in self.unlocked_weapon:
-            self.unlocked_weapon.append(WeaponType.tracking_missile)
-            self.lbl_center.text = "Tracking Missile unlocked\n press 2 to use"
-            self.lbl_center.visible = True
-            self.Scheduler.schedule_frame(lambda text: setattr(text, "visible", False), 120, (self.lbl_center,))  # Hide after 2 seconds
-        
-        self.tps = 1/dt
-
-    def spawn_asteroid(self):
-        side = random.choice(['top', 'left', 'right'])
-        if side == 'top':
-            x = random.randint(0, WIDTH)
-            y = HEIGHT + 50
-            vx = random.uniform(-100, 100)
-            vy = random.uniform(-200, -100)
-        elif side == 'left':
-            x = -50
-            y = random.randint(0, HEIGHT)
-            vx = random.uniform(100, 200)
-            vy = random.uniform(-50, 50)
-        else:  # right
-            x = WIDTH + 50
-            y = random.randint(0, HEIGHT)
-            vx = random.uniform(-200, -100)
-            vy = random.uniform(-50, 50)
-        size_1_percent = (122.42384) / (1 + np.exp(-((-0.340352 * self.asteroid_spawn_rate) + 0.310192)))
-        size_2_percent = 35
-        size_3_percent = (3500650.29) / (1 + np.exp(-((0.256397 * self.asteroid_spawn_rate) - 12.8732)))
-        
-
-        type_val = random.choices([1, 2, 3], weights=[size_1_percent, size_2_percent, size_3_percent])[0]
-        size = [0.126, 0.21, 0.35][type_val-1]
-        self.entities.append(Asteroid(self.registry.sprite("asteroid"), self.batch, x, y, vx, vy, type_val=type_val, size= size))
-
-    def spawn_powerup(self, x, y):
-        self.entities.append(PowerUp(self.registry.sprite("powerup"), x, y, self.batch))
-
-    def game_over(self):
-        self.game_state = game_state.GameOver
-        if self.score > self.high_score:
-            self.high_score = self.score
-            save_high_score(self.score)
-            self.lbl_high.text = f"High Score: {self.high_score}"
+        self.accumulator += dt
+        steps = 0
+        while self.accumulator >= FIXED_DT and steps < MAX_CATCH_UP_STEPS:
+            self.accumulator -= FIXED_DT
+            steps += 1
+            self.tick()
+            if self.engine.game_state != game_state.Playing:
+                self.accumulator = 0.0
+                break
+        if steps == MAX_CATCH_UP_STEPS:
+            # Too far behind, run slower instead of spiralling
+            self.accumulator = min(self.accumulator, FIXED_DT)
+        if steps == 0:
+            return
+
+        # Update UI, only what changed. Timed on its own: the sound, replay and stats work
+        # after the last tick isn't part of it
+        self.engine.timings.skip()
+        self.hud.update(self.engine)
+        self.engine.timings.mark("ui")
+
+    def tick(self):
+        """Runs exactly one FIXED_DT simulation step."""
+        start = time.perf_counter()
+        inputs = self.read_inputs()
+        self.pending_weapon = -1
+        if self.recorder is not None:
+            self.recorder.record(FIXED_DT, inputs, self.engine.auto)
+        self.engine.step(FIXED_DT, inputs)
+        # Everything the tick asked for starts together, once per sound
+        self.voices.update()
+        if self.engine.game_state == game_state.GameOver:
+            # Saved after the whole tick so the final-state digest matches the replay
+            self.save_replay()
+        self.stats.tick(start, time.perf_counter(), len(self.engine.entities))
+
+    def on_weapon_unlocked(self, weapon: WeaponType):
+        self.lbl_center.text = "Tracking Missile unlocked\n press 2 to use"
+        self.lbl_center.visible = True
+        self.engine.Scheduler.schedule_frame(lambda text: setattr(text, "visible", False), 120, (self.lbl_center,))  # Hide after 2 seconds
+
+    def on_game_over(self, new_high_score: bool):
+        if new_high_score:
+            self.hud.high.set(self.engine.high_score)
             self.lbl_center.text = "NEW HIGH SCORE!\n\nGAME OVER\nPRESS ENTER TO RESTART"
         else:
             self.lbl_center.text = "GAME OVER\n\nPRESS ENTER TO RESTART"
@@ -405,11 +261,33 @@ class GameWindow(pyglet.window.Window):
         current_time = time.perf_counter()
         dt = current_time - self.last_time_fps
         self.last_time_fps = current_time
-        self.Scheduler.update_frame(dt)
-        self.lbl_debug.visible = self.debug
-        self.fps = dt**-1
+        self.engine.Scheduler.update_frame(dt)
+
+        # Push the simulation state to the sprite views in one pass, blended
+        # between the last two ticks by how far into the next one we are
+        alpha = min(self.accumulator / FIXED_DT, 1.0) if self.engine.game_state == game_state.Playing else 1.0
+        self.engine.player.sync_sprite(alpha)
+        for entity in self.engine.entities:
+            entity.sync_sprite(alpha)
+
+        self.stats.frame(dt)
+        if self.debug:
+            self.frame_graph.push(dt)
         self.batch.draw()
 
 if __name__ == "__main__":
-    game = GameWindow()
+    parser = argparse.ArgumentParser(description="Astro Shooter")
+    parser.add_argument("--timings", metavar="PATH", help="stream per-phase tick timings to a .csv or .jsonl file")
+    parser.add_argument("--trace-memory", nargs="?", const="1", metavar="PATH",
+                        help="trace allocations and write snapshot diffs to PATH (also ASTRO_TRACE_MEMORY)")
+    parser.add_argument("--memory-interval", type=float, default=0, metavar="SECONDS",
+                        help="also take a memory snapshot every SECONDS while tracing")
+    parser.add_argument("--bot", default="dodge", choices=sorted(BOTS), help="bot that plays in auto mode")
+    args = parser.parse_args()
+    game = GameWindow(
+        timings_path=args.timings,
+        memory_path=memory_tracing_requested(args.trace_memory),
+        memory_interval=args.memory_interval,
+        bot=args.bot,
+    )
     pyglet.app.run()
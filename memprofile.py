@@ -0,0 +1,111 @@
+import os
+import time
+import tracemalloc
+from collections import Counter
+from typing import Dict, List, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from engine import GameEngine
+
+ENTITIES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "entities")
+
+# Frames kept per allocation, enough to walk from numpy/pyglet internals back into entities/
+TRACE_FRAMES = 12
+
+
+def memory_tracing_requested(flag: Optional[str] = None) -> Optional[str]:
+    """Returns the report path if memory tracing was asked for on the command line or
+    through ASTRO_TRACE_MEMORY (a path, or 1 for the default one), else None."""
+    value = flag or os.environ.get("ASTRO_TRACE_MEMORY", "")
+    if value.lower() in ("", "0", "false", "no"):
+        return None
+    if value.lower() in ("1", "true", "yes"):
+        from highscore import get_high_score_path
+        return get_high_score_path("memory_diffs.txt")
+    return value
+
+
+class MemoryProfiler:
+    """tracemalloc snapshots diffed against the previous one.
+
+    Tracing slows down every allocation, so this only exists when asked for.
+    Each report lists the growth per file and per entity type (bytes allocated
+    under entities/<module>.py plus live and pooled instance counts) and is
+    appended to `path`.
+    """
+
+    def __init__(self, engine: "GameEngine", path: str, top: int = 15) -> None:
+        self.engine = engine
+        self.path = path
+        self.top = top
+        self.started = time.perf_counter()
+        tracemalloc.start(TRACE_FRAMES)
+        self.previous = self._take()
+        self.previous_counts = self._entity_counts()
+        self.count = 0
+
+    @staticmethod
+    def _take() -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        ))
+
+    def _entity_counts(self) -> Counter:
+        counts = Counter(type(entity).__name__ for entity in self.engine.entities)
+        for cls, free in self.engine.pool.free.items():
+            counts[f"{cls.__name__} (pooled)"] += len(free)
+        return counts
+
+    @staticmethod
+    def _bytes_by_entity(diffs: List[tracemalloc.StatisticDiff]) -> Dict[str, List[int]]:
+        """Charges each allocation site to the outermost entities/ module on its traceback,
+        so memory allocated by GameObject.__init__ lands on the subclass that called it."""
+        grouped: Dict[str, List[int]] = {}
+        for diff in diffs:
+            for frame in diff.traceback:
+                if frame.filename.startswith(ENTITIES_DIR):
+                    name = os.path.splitext(os.path.basename(frame.filename))[0]
+                    size_count = grouped.setdefault(name, [0, 0])
+                    size_count[0] += diff.size_diff
+                    size_count[1] += diff.count_diff
+                    break
+        return grouped
+
+    def snapshot(self) -> str:
+        """Takes a snapshot, appends its diff against the previous one to the report and returns it."""
+        current = self._take()
+        counts = self._entity_counts()
+        self.count += 1
+
+        by_file = current.compare_to(self.previous, "filename")
+        by_entity = self._bytes_by_entity(current.compare_to(self.previous, "traceback"))
+        traced, peak = tracemalloc.get_traced_memory()
+
+        lines = [
+            f"=== snapshot {self.count} at {time.perf_counter() - self.started:.1f}s, "
+            f"traced {traced / 2**20:.2f} MiB (peak {peak / 2**20:.2f} MiB) ===",
+            "-- by entity type --",
+        ]
+        for name, (size, count) in sorted(by_entity.items(), key=lambda item: -abs(item[1][0])):
+            lines.append(f"{name}: {size / 1024:+.1f} KiB in {count:+d} blocks")
+        for name in sorted(set(counts) | set(self.previous_counts)):
+            change = counts[name] - self.previous_counts[name]
+            lines.append(f"{name}: {counts[name]} instances ({change:+d})")
+        lines.append("-- by file --")
+        lines.extend(str(stat) for stat in by_file[:self.top] if stat.size_diff)
+
+        report = "\n".join(lines)
+        with open(self.path, "a") as f:
+            f.write(report + "\n\n")
+        self.previous = current
+        self.previous_counts = counts
+        return report
+
+    def status(self) -> str:
+        traced, _ = tracemalloc.get_traced_memory()
+        return f"Traced: {traced / 2**20:.2f} MiB, {self.count} snapshots"
+
+    def stop(self) -> None:
+        tracemalloc.stop()
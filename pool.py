@@ -0,0 +1,52 @@
+from typing import Dict, List, Type, TypeVar
+
+from entities.GameObject import GameObject
+
+T = TypeVar("T", bound=GameObject)
+
+
+class ObjectPool:
+    """Per-type free lists for game objects and their sprite views.
+
+    Released objects are hidden instead of deleted, so their Sprite keeps its
+    slot in the Batch. acquire() hands them back out through their reset() hook.
+    """
+
+    def __init__(self, max_free: int = 512) -> None:
+        self.max_free = max_free
+        self.free: Dict[type, List[GameObject]] = {}
+        self.hits: Dict[type, int] = {}
+        self.misses: Dict[type, int] = {}
+
+    def acquire(self, cls: Type[T], *args, **kwargs) -> T:
+        """Returns a recycled `cls` reinitialized with the given arguments, or a new one."""
+        free = self.free.get(cls)
+        if free:
+            obj = free.pop()
+            obj.reset(*args, **kwargs)
+            self.hits[cls] = self.hits.get(cls, 0) + 1
+            return obj
+        self.misses[cls] = self.misses.get(cls, 0) + 1
+        return cls(*args, **kwargs)
+
+    def release(self, obj: GameObject) -> None:
+        """Takes an object out of play; it is kept for reuse unless its free list is full."""
+        obj.active = False
+        free = self.free.setdefault(type(obj), [])
+        if len(free) < self.max_free:
+            obj.hide()
+            free.append(obj)
+        else:
+            obj.delete()
+
+    def clear(self) -> None:
+        """Deletes every pooled object and its sprite."""
+        for free in self.free.values():
+            for obj in free:
+                obj.delete()
+            free.clear()
+
+    def summary(self) -> List[str]:
+        """One 'Type: hits/misses' line per pooled type, for the debug overlay."""
+        types = sorted(set(self.hits) | set(self.misses), key=lambda cls: cls.__name__)
+        return [f"{cls.__name__} pool: {self.hits.get(cls, 0)}/{self.misses.get(cls, 0)}" for cls in types]
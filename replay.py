@@ -0,0 +1,142 @@
+import gzip
+import hashlib
+import os
+import struct
+import sys
+import time
+from typing import List, Tuple
+
+from bots import make_bot
+from engine import GameEngine, InputState, headless_registry
+from gamestate import game_state
+
+MAGIC = b"ASRP"
+VERSION = 2
+
+# magic, version, seed, width, height, tick count
+_HEADER = struct.Struct("<4sHQHHI")
+# Since version 2 the header is followed by the name of the bot (in BOTS) that played in auto mode
+_BOT_NAME = struct.Struct("<B")
+# dt, aim_x, aim_y, button flags, weapon slot
+_TICK = struct.Struct("<dddBb")
+
+_UP, _DOWN, _LEFT, _RIGHT, _FIRING, _AUTO = (1 << i for i in range(6))
+
+
+def state_digest(engine: GameEngine) -> bytes:
+    """Hashes everything a replay has to reproduce: score, lives, the player and every entity."""
+    h = hashlib.sha1()
+    player = engine.player
+    h.update(struct.pack("<qqIddd", engine.score, engine.lives, engine.ticks, player.x, player.y, player.rotation))
+    for entity in engine.entities:
+        h.update(type(entity).__name__.encode())
+        h.update(struct.pack("<ddd?", entity.x, entity.y, entity.rotation, entity.active))
+    return h.digest()
+
+
+class ReplayRecorder:
+    """Collects the per-tick inputs of one game in the compact binary replay format."""
+
+    def __init__(self, seed: int, width: int, height: int, bot: str = "dodge") -> None:
+        self.seed = seed
+        self.width = width
+        self.height = height
+        self.bot = bot
+        self.ticks: List[bytes] = []
+
+    def record(self, dt: float, inputs: InputState, auto: bool = False) -> None:
+        """Packs one tick. Call it before GameEngine.step, the aim bot rewrites the inputs in place."""
+        flags = (
+            (_UP if inputs.up else 0)
+            | (_DOWN if inputs.down else 0)
+            | (_LEFT if inputs.left else 0)
+            | (_RIGHT if inputs.right else 0)
+            | (_FIRING if inputs.firing else 0)
+            | (_AUTO if auto else 0)
+        )
+        self.ticks.append(_TICK.pack(dt, inputs.aim_x, inputs.aim_y, flags, inputs.weapon))
+
+    def to_bytes(self, engine: GameEngine) -> bytes:
+        header = _HEADER.pack(MAGIC, VERSION, self.seed, self.width, self.height, len(self.ticks))
+        bot = self.bot.encode()
+        return header + _BOT_NAME.pack(len(bot)) + bot + b"".join(self.ticks) + state_digest(engine)
+
+    def save(self, path: str, engine: GameEngine) -> None:
+        """Writes the replay, ending with a digest of the engine state it should reproduce."""
+        with gzip.open(path, "wb") as f:
+            f.write(self.to_bytes(engine))
+
+
+class Replay:
+    def __init__(self, seed: int, width: int, height: int, ticks: List[Tuple[float, InputState, bool]], digest: bytes,
+                 bot: str = "dodge") -> None:
+        self.seed = seed
+        self.width = width
+        self.height = height
+        self.bot = bot
+        self.ticks = ticks
+        self.digest = digest
+
+
+def load_replay(path: str) -> Replay:
+    with gzip.open(path, "rb") as f:
+        data = f.read()
+    magic, version, seed, width, height, count = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a replay file")
+    if version not in (1, VERSION):
+        raise ValueError(f"Unsupported replay version {version} in {path}")
+
+    ticks = []
+    offset = _HEADER.size
+    bot = "dodge"  # version 1 only had the one bot
+    if version >= 2:
+        (length,) = _BOT_NAME.unpack_from(data, offset)
+        offset += _BOT_NAME.size
+        bot = data[offset:offset + length].decode()
+        offset += length
+    for dt, aim_x, aim_y, flags, weapon in _TICK.iter_unpack(data[offset:offset + count * _TICK.size]):
+        inputs = InputState(
+            up=bool(flags & _UP),
+            down=bool(flags & _DOWN),
+            left=bool(flags & _LEFT),
+            right=bool(flags & _RIGHT),
+            aim_x=aim_x,
+            aim_y=aim_y,
+            firing=bool(flags & _FIRING),
+            weapon=weapon,
+        )
+        ticks.append((dt, inputs, bool(flags & _AUTO)))
+    digest = data[offset + count * _TICK.size:]
+    return Replay(seed, width, height, ticks, digest, bot)
+
+
+def run_replay(replay: Replay, engine: GameEngine) -> bool:
+    """Re-runs a recorded game on `engine`. Returns True if it ended in the exact recorded state."""
+    engine.bot = make_bot(replay.bot)
+    engine.start(replay.seed)
+    for dt, inputs, auto in replay.ticks:
+        engine.auto = auto
+        engine.step(dt, inputs)
+    return state_digest(engine) == replay.digest
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("usage: python replay.py <file.replay>")
+        sys.exit(2)
+
+    replay = load_replay(sys.argv[1])
+    engine = GameEngine(
+        headless_registry(os.path.dirname(os.path.abspath(__file__))),
+        replay.width,
+        replay.height,
+        save_high_scores=False,
+    )
+    start = time.perf_counter()
+    matched = run_replay(replay, engine)
+    elapsed = time.perf_counter() - start
+    print(f"{len(replay.ticks)} ticks in {elapsed:.2f}s, score {engine.score}, state {'matches' if matched else 'DIVERGED'}")
+    if engine.game_state == game_state.Playing:
+        print("note: the recording stopped before game over")
+    sys.exit(0 if matched else 1)
@@ -1,8 +1,54 @@
+from concurrent.futures import ThreadPoolExecutor
+import io
 from pathlib import Path
-from typing import Dict, Tuple, Union
+from typing import Dict, Optional, Tuple, Union
 import numpy as np
 from Weapons import WeaponType
+from utils import shape_cache
+from assetcache import AssetCache
+from highscore import get_high_score_path
 import pyglet
+from pyglet.media.codecs.base import AudioData, AudioFormat, StaticSource
+
+# key -> (file in sprites/, center the anchor)
+SPRITE_FILES = {
+    'player': ('player.png', True),
+    WeaponType.laser.value: ('laser.png', True),
+    'asteroid': ('astrode.png', True),
+    'explosion': ('explosion.png', True),
+    'powerup': ('powerup.png', True),
+    'cursor': ('pointer.png', False),
+    WeaponType.tracking_missile.value: ('missile.png', True),
+}
+
+# key -> (file in sounds/, stream it instead of decoding it up front)
+SOUND_FILES = {
+    WeaponType.laser.value: ('laserShoot.wav', False),
+    'explosion': ('explosion.wav', False),
+    'powerup': ('powerUp.wav', False),
+    'music': ('background.wav', True),
+    WeaponType.tracking_missile.value: ('missile.wav', False),
+}
+
+
+def default_cache_path() -> str:
+    return get_high_score_path("assets.cache")
+
+
+class PCMSource(pyglet.media.Source):
+    """Already decoded PCM exposed as a Source, so a StaticSource can be built from the asset cache."""
+
+    def __init__(self, pcm: bytes, audio_format: AudioFormat) -> None:
+        self._file = io.BytesIO(pcm)
+        self.audio_format = audio_format
+        self._duration = len(pcm) / audio_format.bytes_per_second
+
+    def get_audio_data(self, num_bytes: int, compensation_time: float = 0.0) -> Optional[AudioData]:
+        timestamp = self._file.tell() / self.audio_format.bytes_per_second
+        data = self._file.read(int(num_bytes))
+        if not data:
+            return None
+        return AudioData(data, len(data), timestamp, len(data) / self.audio_format.bytes_per_second)
 
 
 class AssetRegistry:
@@ -31,11 +77,59 @@ class AssetRegistry:
     def sound(self, key: str) -> pyglet.media.Source:
         return self._sounds[key]
 
-    def play(self, key: str) -> None:
-        try:
-            self.sound(key).play()
-        except:
-            print(f"error on playing sound {key}")
+
+def pack_atlas(
+    images: Dict[str, pyglet.image.AbstractImage],
+    padding: int = 2,
+    mipmaps: bool = False,
+    max_size: int = 4096,
+) -> Dict[str, pyglet.image.TextureRegion]:
+    """Packs images into a single texture so sprites of every type share one texture bind.
+
+    Args:
+        images (Dict[str, AbstractImage]): the CPU-side images to pack
+        padding (int, optional): blank pixels around each image so filtering doesn't bleed into its neighbours. Defaults to 2.
+        mipmaps (bool, optional): generate mipmaps for heavily scaled-down sprites, needs more padding to stay clean. Defaults to False.
+        max_size (int, optional): largest atlas edge to try before giving up. Defaults to 4096.
+
+    Returns:
+        Dict[str, TextureRegion]: the atlas region of each image, with the same anchors.
+    """
+    from pyglet.image.atlas import TextureAtlas, AllocatorException
+
+    # blit_into offsets by the anchor, so images go in unanchored and the regions get the anchors
+    anchors = {key: (image.anchor_x, image.anchor_y) for key, image in images.items()}
+    for image in images.values():
+        image.anchor_x = image.anchor_y = 0
+
+    # Tallest first packs the shelves tightest
+    order = sorted(images, key=lambda key: images[key].height, reverse=True)
+    size = 256
+    try:
+        while True:
+            atlas = TextureAtlas(size, size)
+            try:
+                regions = {key: atlas.add(images[key], border=padding) for key in order}
+                break
+            except AllocatorException:
+                atlas.texture.delete()
+                if size >= max_size:
+                    raise RuntimeError(f'Sprites do not fit in a {max_size}x{max_size} atlas')
+                size *= 2
+    finally:
+        for key, image in images.items():
+            image.anchor_x, image.anchor_y = anchors[key]
+
+    for key, region in regions.items():
+        region.anchor_x, region.anchor_y = anchors[key]
+
+    if mipmaps:
+        from pyglet import gl
+        texture = atlas.texture
+        gl.glBindTexture(texture.target, texture.id)
+        gl.glGenerateMipmap(texture.target)
+        gl.glTexParameteri(texture.target, gl.GL_TEXTURE_MIN_FILTER, gl.GL_LINEAR_MIPMAP_LINEAR)
+    return regions
 
 
 class resource_manager:
@@ -72,24 +166,135 @@ class resource_manager:
             raise RuntimeError(f'Missing sound asset: {p}')
         return pyglet.media.load(str(p), streaming=streaming)
 
-    def load_resources(self) -> AssetRegistry:
+    def decode_image(self, path: Path) -> Tuple[int, int, bytes, np.ndarray]:
+        """Decodes a PNG to (width, height, RGBA bytes, alpha mask), safe to run on a worker thread."""
+        img = self.load_image(path)
+        rgba = img.get_data('RGBA', img.width * 4)
+        mask = np.frombuffer(rgba, dtype=np.uint8).reshape((img.height, img.width, 4))[:, :, 3] > 0
+        return img.width, img.height, rgba, mask
+
+    def decode_sound(self, path: Path) -> Tuple[Tuple[int, int, int], bytes]:
+        """Decodes a sound to ((channels, sample_size, sample_rate), PCM bytes), safe to run on a worker thread."""
+        source = self.load_sound(path, streaming=True)
+        audio_format = source.audio_format
+        chunks = []
+        while True:
+            audio_data = source.get_audio_data(1 << 20)
+            if audio_data is None:
+                break
+            chunks.append(audio_data.data)
+        return (audio_format.channels, audio_format.sample_size, audio_format.sample_rate), b''.join(chunks)
+
+    def load_resources(
+        self,
+        load_sounds: bool = True,
+        load_music: bool = True,
+        atlas: bool = True,
+        atlas_padding: int = 2,
+        atlas_mipmaps: bool = False,
+        cache: bool = True,
+        cache_path: Optional[str] = None,
+        workers: int = 4,
+    ) -> AssetRegistry:
+        """Loads every sprite and sound.
+
+        Decoded images, their collision masks and the PCM of the static sounds
+        come from the asset cache when their source files are unchanged; the
+        rest is decoded on a thread pool and written back to the cache.
+
+        Args:
+            load_sounds (bool, optional): open the sounds, headless runs skip them. Defaults to True.
+            load_music (bool, optional): with load_sounds, also open the streamed music. Defaults to True.
+            atlas (bool, optional): pack the sprites into one texture atlas, needs a GL context. Defaults to True.
+            atlas_padding (int, optional): blank pixels around each sprite in the atlas. Defaults to 2.
+            atlas_mipmaps (bool, optional): generate mipmaps for the atlas. Defaults to False.
+            cache (bool, optional): use the asset cache. Defaults to True.
+            cache_path (str, optional): where the cache lives. Defaults to ~/.astro_shooter/assets.cache.
+            workers (int, optional): decoding threads for cache misses. Defaults to 4.
+
+        Returns:
+            AssetRegistry: the loaded assets.
+        """
         sprite_dir = self.base_path / 'sprites'
         sound_dir = self.base_path / 'sounds'
-        sprites = {
-            'player': self.load_image(sprite_dir / 'player.png', center_anchor=True),
-            WeaponType.laser.value: self.load_image(sprite_dir / 'laser.png', center_anchor=True),
-            'asteroid': self.load_image(sprite_dir / 'astrode.png', center_anchor=True),
-            'explosion': self.load_image(sprite_dir / 'explosion.png', center_anchor=True),
-            'powerup': self.load_image(sprite_dir / 'powerup.png', center_anchor=True),
-            'cursor': self.load_image(sprite_dir / 'pointer.png', center_anchor=False),
-            WeaponType.tracking_missile.value: self.load_image(sprite_dir / 'missile.png', center_anchor=True),
-        }
-        sounds = {
-            WeaponType.laser.value: self.load_sound(sound_dir / 'laserShoot.wav', streaming=False),
-            'explosion': self.load_sound(sound_dir / 'explosion.wav', streaming=False),
-            'powerup': self.load_sound(sound_dir / 'powerUp.wav', streaming=False),
-            'music': self.load_sound(sound_dir / 'background.wav', streaming=True),
-            WeaponType.tracking_missile.value: self.load_sound(sound_dir / 'missile.wav', streaming=False),
-        }
-        return AssetRegistry(sprites, sounds)
+        asset_cache = AssetCache(cache_path or default_cache_path()).load() if cache else None
+
+        decoded_images: Dict[str, Tuple[int, int, bytes, np.ndarray]] = {}
+        decoded_sounds: Dict[str, Tuple[Tuple[int, int, int], bytes]] = {}
+        self.cache_hits = self.cache_misses = 0
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            jobs = []
+            for key, (filename, _) in SPRITE_FILES.items():
+                path = sprite_dir / filename
+                if not path.exists():
+                    raise RuntimeError(f'Missing image asset: {path}')
+                hit = asset_cache.image('sprites/' + key, path) if asset_cache else None
+                if hit is not None:
+                    decoded_images[key] = hit
+                else:
+                    jobs.append((key, path, decoded_images, executor.submit(self.decode_image, path)))
+            if load_sounds:
+                for key, (filename, streaming) in SOUND_FILES.items():
+                    if streaming and not load_music:
+                        continue
+                    path = sound_dir / filename
+                    if not path.exists():
+                        raise RuntimeError(f'Missing sound asset: {path}')
+                    if streaming:
+                        continue
+                    hit = asset_cache.sound('sounds/' + key, path) if asset_cache else None
+                    if hit is not None:
+                        decoded_sounds[key] = hit
+                    else:
+                        jobs.append((key, path, decoded_sounds, executor.submit(self.decode_sound, path)))
+
+            self.cache_hits = len(decoded_images) + len(decoded_sounds)
+            self.cache_misses = len(jobs)
+            for key, path, decoded, future in jobs:
+                decoded[key] = future.result()
+                if asset_cache is not None:
+                    if decoded is decoded_images:
+                        asset_cache.put_image('sprites/' + key, path, *decoded[key])
+                    else:
+                        asset_cache.put_sound('sounds/' + key, path, *decoded[key])
+
+        if asset_cache is not None:
+            try:
+                asset_cache.save()
+            except OSError as e:
+                print(f"could not write the asset cache: {e}")
+            asset_cache.close()
 
+        sprites = {}
+        masks = {}
+        for key, (_, center_anchor) in SPRITE_FILES.items():
+            width, height, rgba, mask = decoded_images[key]
+            img = pyglet.image.ImageData(width, height, 'RGBA', rgba, pitch=width * 4)
+            if center_anchor:
+                img.anchor_x = width // 2
+                img.anchor_y = height // 2
+            sprites[key] = img
+            masks[key] = mask
+        if atlas:
+            # The cursor is drawn by the window, not the batch, so it stays a separate image
+            packed = {key: image for key, image in sprites.items() if key != 'cursor'}
+            sprites.update(pack_atlas(packed, atlas_padding, atlas_mipmaps))
+
+        # Collision shapes are ready before the first hit instead of built mid-game
+        for key, image in sprites.items():
+            if key != 'cursor':
+                shape_cache.add_mask(image, masks[key])
+                shape_cache.get(image)
+
+        if not load_sounds:
+            # Headless runs never open the audio device
+            return AssetRegistry(sprites, {})
+        sounds = {}
+        for key, (filename, streaming) in SOUND_FILES.items():
+            if streaming:
+                if load_music:
+                    sounds[key] = self.load_sound(sound_dir / filename, streaming=True)
+            else:
+                audio_format, pcm = decoded_sounds[key]
+                sounds[key] = StaticSource(PCMSource(pcm, AudioFormat(*audio_format)))
+        return AssetRegistry(sprites, sounds)
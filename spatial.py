@@ -0,0 +1,71 @@
+from typing import Dict, Iterable, List, Tuple
+
+
+class SpatialHash:
+    """Uniform-grid broad phase used to find entities that might be colliding.
+
+    Every entity is inserted into each cell its bounding square overlaps, so two
+    sprites whose bounding circles overlap are guaranteed to share a cell.
+    """
+
+    def __init__(self, cell_size: float = 64) -> None:
+        self.cell_size = cell_size
+        self.cells: Dict[Tuple[int, int], List] = {}
+
+    def clear(self) -> None:
+        self.cells.clear()
+
+    def _cell_range(self, x: float, y: float, radius: float):
+        size = self.cell_size
+        return (
+            int((x - radius) // size),
+            int((x + radius) // size),
+            int((y - radius) // size),
+            int((y + radius) // size),
+        )
+
+    def insert(self, entity) -> None:
+        """Adds an entity to every cell touched by its bounding square."""
+        radius = max(entity.width, entity.height) / 2.0
+        x0, x1, y0, y1 = self._cell_range(entity.x, entity.y, radius)
+        cells = self.cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    cells[(cx, cy)] = [entity]
+                else:
+                    bucket.append(entity)
+
+    def rebuild(self, entities: Iterable) -> None:
+        """Clears the grid and inserts every active entity."""
+        self.cells.clear()
+        for entity in entities:
+            if entity.active:
+                self.insert(entity)
+
+    def query(self, entity) -> List:
+        """Returns the entities sharing at least one cell with `entity` (excluding itself).
+
+        Args:
+            entity: anything with x, y, width and height, it does not need to be in the grid.
+
+        Returns:
+            List: each candidate once.
+        """
+        radius = max(entity.width, entity.height) / 2.0
+        x0, x1, y0, y1 = self._cell_range(entity.x, entity.y, radius)
+        cells = self.cells
+        seen = set()
+        found = []
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    continue
+                for other in bucket:
+                    if other is entity or id(other) in seen:
+                        continue
+                    seen.add(id(other))
+                    found.append(other)
+        return found
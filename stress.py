@@ -0,0 +1,236 @@
+"""Ramps the number of asteroids and projectiles until the game can't hold 60 Hz,
+and reports the entity count where each subsystem breaks.
+
+    python stress.py                      # update, collision and audio, headless
+    python stress.py --draw               # also time drawing the batch in a hidden window
+    python stress.py --json after.json --compare before.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+import pyglet
+
+SUBSYSTEMS = ("update", "collision", "audio", "draw")
+
+
+class Level(NamedTuple):
+    asteroids: int  # population held during the level
+    projectiles: int
+    entities: float  # mean live entity count, explosions and power-ups included
+    p99_ms: Dict[str, float]  # per subsystem, plus "total"
+
+
+class StressRun:
+    """An engine whose asteroid and projectile population is held at a target while it is timed.
+
+    The player is invulnerable and idle; projectiles are lasers fired from
+    random points, so they hit asteroids and cause explosions and sounds like
+    in a real game. Topping the population up is not timed.
+    """
+
+    def __init__(self, registry, batch=None, voices=None, seed: int = 0) -> None:
+        from engine import GameEngine, TICK_PHASES
+        from timing import PhaseTimer
+
+        self.engine = GameEngine(registry, batch=batch, save_high_scores=False)
+        self.engine.start(seed)
+        self.engine.player.is_vulnerable = False
+        self.batch = batch
+        self.voices = voices
+        if voices is not None:
+            self.engine.push_handlers(on_sound=voices.play)
+        self._phases = TICK_PHASES
+        self._timer = PhaseTimer
+        # Everything in a tick that isn't the collision pass
+        self.update_phases = [phase for phase in TICK_PHASES if phase not in ("collision", "ui")]
+
+    def top_up(self, asteroids: int, projectiles: int) -> None:
+        from entities.laser import Laser
+        from Weapons import WeaponType
+
+        engine = self.engine
+        missing = asteroids - len(engine.entities.hostiles)
+        if missing > 0:
+            engine.spawn_wave(missing)
+        missing = projectiles - len(engine.entities.weapons)
+        if missing > 0:
+            image = engine.registry.sprite(WeaponType.laser.value)
+            x = engine.rng.uniform(0, engine.width, missing).tolist()
+            y = engine.rng.uniform(0, engine.height, missing).tolist()
+            rotation = engine.rng.uniform(0, 360, missing).tolist()
+            for i in range(missing):
+                engine.add_entity(engine.pool.acquire(Laser, image, x[i], y[i], rotation[i], self.batch))
+
+    def measure(self, asteroids: int, projectiles: int, ticks: int, warmup: int) -> Level:
+        """Holds the population for `warmup` + `ticks` ticks and returns the p99 of the timed ones."""
+        from engine import FIXED_DT
+
+        engine = self.engine
+        for _ in range(warmup):
+            self.top_up(asteroids, projectiles)
+            engine.step(FIXED_DT)
+
+        engine.timings = self._timer(self._phases, size=ticks)
+        audio = np.zeros(ticks)
+        draw = np.zeros(ticks)
+        entities = np.zeros(ticks)
+        clock = time.perf_counter
+        for i in range(ticks):
+            self.top_up(asteroids, projectiles)
+            entities[i] = len(engine.entities)
+            engine.step(FIXED_DT)
+            if self.voices is not None:
+                start = clock()
+                self.voices.update()
+                audio[i] = clock() - start
+            if self.batch is not None:
+                draw[i] = self.draw_frame()
+        engine.timings.commit()
+
+        history = engine.timings.history
+        times = {
+            "update": sum(history[phase].values() for phase in self.update_phases),
+            "collision": history["collision"].values(),
+            "audio": audio,
+            "draw": draw,
+        }
+        times["total"] = sum(times.values())
+        p99 = {name: float(np.percentile(values, 99) * 1e3) for name, values in times.items()}
+        return Level(asteroids, projectiles, float(entities.mean()), p99)
+
+    def draw_frame(self) -> float:
+        """Syncs the sprites and draws the batch like GameWindow.on_draw, waiting for the GPU to finish."""
+        from pyglet.gl import glFinish
+
+        start = time.perf_counter()
+        self.engine.player.sync_sprite()
+        for entity in self.engine.entities:
+            entity.sync_sprite()
+        self.batch.draw()
+        glFinish()
+        return time.perf_counter() - start
+
+
+def ramp(run: StressRun, start: int, factor: float, max_asteroids: int, projectile_ratio: float,
+         ticks: int, budget_ms: float, stop_ms: float, subsystems=SUBSYSTEMS) -> List[Level]:
+    """Grows the asteroid count by `factor` per level until every subsystem in `subsystems` went
+    over budget on its own, the total p99 passes `stop_ms` or max_asteroids is reached."""
+    levels: List[Level] = []
+    asteroids = start
+    while asteroids <= max_asteroids:
+        level = run.measure(asteroids, int(asteroids * projectile_ratio), ticks, warmup=ticks // 4)
+        levels.append(level)
+        print(format_level(level), flush=True)
+        if level.p99_ms["total"] > stop_ms or all(
+            any(lv.p99_ms[name] > budget_ms for lv in levels) for name in subsystems
+        ):
+            break
+        asteroids = max(asteroids + 1, int(asteroids * factor))
+    return levels
+
+
+def breaking_points(levels: List[Level], budget_ms: float, subsystems=SUBSYSTEMS) -> Dict[str, Optional[Level]]:
+    """The first level where each subsystem's p99 (and the total) went over budget, None if none did."""
+    return {
+        name: next((level for level in levels if level.p99_ms[name] > budget_ms), None)
+        for name in tuple(subsystems) + ("total",)
+    }
+
+
+def format_level(level: Level) -> str:
+    times = "".join(f"{level.p99_ms[name]:>10.2f}" for name in SUBSYSTEMS + ("total",))
+    return f"{level.asteroids:>9} {level.projectiles:>11} {level.entities:>9.0f}{times}"
+
+
+def _entities(value: Optional[float]) -> str:
+    return "not reached" if value is None else f"{value:.0f}"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=1000 / 60, help="p99 budget per tick, default one 60 Hz frame")
+    parser.add_argument("--start", type=int, default=25, help="asteroids in the first level")
+    parser.add_argument("--factor", type=float, default=1.5, help="asteroid growth per level")
+    parser.add_argument("--max-asteroids", type=int, default=20_000)
+    parser.add_argument("--projectile-ratio", type=float, default=0.5, help="projectiles held per asteroid")
+    parser.add_argument("--ticks", type=int, default=240, help="timed ticks per level")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--draw", action="store_true", help="time drawing in a hidden window (needs a GL context)")
+    parser.add_argument("--headless-gl", action="store_true", help="with --draw, use a headless EGL context")
+    parser.add_argument("--audio", action="store_true", help="play through real pyglet players instead of null voices")
+    parser.add_argument("--stop-at", type=float, default=4.0, metavar="BUDGETS",
+                        help="stop once the total p99 is this many budgets, default 4 (1 stops at the first miss)")
+    parser.add_argument("--json", metavar="PATH", help="write every level and the breaking points to PATH")
+    parser.add_argument("--compare", metavar="PATH", help="report how the breaking points moved against an earlier --json")
+    args = parser.parse_args(argv)
+
+    # Must be decided before anything opens a GL context or the audio device
+    if args.draw and args.headless_gl:
+        pyglet.options['headless'] = True
+    if not args.draw:
+        pyglet.options['shadow_window'] = False
+    if not args.audio:
+        pyglet.options['audio'] = ('silent',)
+
+    from audio import NullVoice, PygletVoice, VoiceManager
+    from engine import WIDTH, HEIGHT
+    from resources import resource_manager
+
+    window = batch = None
+    if args.draw:
+        window = pyglet.window.Window(WIDTH, HEIGHT, visible=False)
+        batch = pyglet.graphics.Batch()
+    # Only the sound effects, the music is never played here
+    registry = resource_manager(os.path.dirname(os.path.abspath(__file__))).load_resources(load_music=False, atlas=args.draw)
+    voices = VoiceManager(registry.sounds, voice_factory=PygletVoice if args.audio else NullVoice)
+    run = StressRun(registry, batch, voices, args.seed)
+
+    print(f"p99 ms per tick, budget {args.budget_ms:.2f} ms{'' if args.draw else ' (draw not measured, see --draw)'}")
+    print(f"{'asteroids':>9} {'projectiles':>11} {'entities':>9}" + "".join(f"{name:>10}" for name in SUBSYSTEMS + ("total",)))
+    subsystems = [name for name in SUBSYSTEMS if args.draw or name != "draw"]
+    levels = ramp(run, args.start, args.factor, args.max_asteroids, args.projectile_ratio,
+                  args.ticks, args.budget_ms, args.stop_at * args.budget_ms, subsystems)
+    points = breaking_points(levels, args.budget_ms, subsystems)
+
+    print("\nbreaking points (first level over budget):")
+    for name, level in points.items():
+        if level is None:
+            last = levels[-1]
+            print(f"  {name:>9}: not reached up to {last.asteroids} asteroids (~{last.entities:.0f} entities), "
+                  f"p99 {last.p99_ms[name]:.2f} ms there")
+        else:
+            print(f"  {name:>9}: {level.asteroids} asteroids + {level.projectiles} projectiles "
+                  f"(~{level.entities:.0f} entities), p99 {level.p99_ms[name]:.2f} ms")
+
+    ceilings = {name: (level.entities if level else None) for name, level in points.items()}
+    if args.compare:
+        with open(args.compare) as f:
+            before = json.load(f)["ceilings"]
+        print("\nagainst " + args.compare + ":")
+        for name, entities in ceilings.items():
+            old = before.get(name)
+            change = f" ({(entities / old - 1) * 100:+.0f}%)" if entities and old else ""
+            print(f"  {name:>9}: {_entities(old)} -> {_entities(entities)} entities{change}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({
+                "budget_ms": args.budget_ms,
+                "draw": args.draw,
+                "levels": [level._asdict() for level in levels],
+                "ceilings": ceilings,
+            }, f, indent=2)
+
+    voices.delete()
+    if window is not None:
+        window.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,11 @@
+import os
+import sys
+
+import pyglet
+
+# The game modules live at the repo root, not in a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Tests run headless: no shadow window, and sounds never reach an audio device
+pyglet.options['shadow_window'] = False
+pyglet.options['audio'] = ('silent',)
@@ -0,0 +1,129 @@
+from audio import NullVoice, VoiceManager
+
+
+class Source:
+    def __init__(self, duration):
+        self.duration = duration
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+SOUNDS = {"laser": Source(0.5), "explosion": Source(1.0), "powerup": Source(0.5)}
+
+
+def manager(voices=4, caps=None):
+    clock = Clock()
+    voices = VoiceManager(SOUNDS, voices=voices, voice_factory=NullVoice,
+                          caps=caps if caps is not None else {}, clock=clock)
+    return voices, clock
+
+
+def playing(voices):
+    now = voices.clock()
+    return sorted(slot.key for slot in voices.slots if slot.busy_until > now)
+
+
+def test_play_only_queues_until_update():
+    voices, _ = manager()
+    voices.play("laser")
+    assert voices.played == 0
+    assert sum(slot.voice.plays for slot in voices.slots) == 0
+
+    voices.update()
+    assert voices.played == 1
+    assert playing(voices) == ["laser"]
+
+
+def test_same_tick_requests_coalesce():
+    voices, _ = manager()
+    for _ in range(5):
+        voices.play("laser")
+    voices.play("explosion")
+    voices.update()
+
+    assert voices.coalesced == 4
+    assert voices.played == 2
+    assert playing(voices) == ["explosion", "laser"]
+
+
+def test_cap_restarts_the_oldest_voice_of_that_sound():
+    voices, clock = manager(caps={"laser": 2})
+    for tick in range(3):
+        clock.now = tick * 0.1
+        voices.play("laser")
+        voices.update()
+
+    assert playing(voices) == ["laser", "laser"]
+    # The voice started at 0.0 was restarted at 0.2, the one from 0.1 kept playing
+    assert sorted(slot.started for slot in voices.slots if slot.key == "laser") == [0.1, 0.2]
+    assert voices.played == 3
+    assert voices.stolen == voices.dropped == 0
+
+
+def test_voices_free_up_when_their_sound_ends():
+    voices, clock = manager(voices=1)
+    voices.play("laser")
+    voices.update()
+    clock.now = 0.6
+    voices.play("powerup")
+    voices.update()
+
+    assert playing(voices) == ["powerup"]
+    assert voices.stolen == voices.dropped == 0
+
+
+def test_higher_priority_steals_the_oldest_lower_priority_voice():
+    voices, clock = manager(voices=2)
+    for tick in range(2):
+        clock.now = tick * 0.1
+        voices.play("laser")
+        voices.update()
+
+    clock.now = 0.2
+    voices.play("explosion")
+    voices.update()
+
+    assert voices.stolen == 1
+    assert playing(voices) == ["explosion", "laser"]
+    assert next(slot for slot in voices.slots if slot.key == "laser").started == 0.1
+
+
+def test_lower_or_equal_priority_is_dropped_when_every_voice_is_busy():
+    voices, clock = manager(voices=1)
+    voices.play("explosion")
+    voices.update()
+
+    clock.now = 0.1
+    voices.play("laser")
+    voices.update()
+    voices.play("explosion")
+    voices.update()
+
+    assert voices.dropped == 1  # the laser, the explosion restarts its own voice
+    assert playing(voices) == ["explosion"]
+
+
+def test_update_starts_the_highest_priority_first():
+    voices, _ = manager(voices=1)
+    voices.play("laser")
+    voices.play("powerup")
+    voices.play("explosion")
+    voices.update()
+
+    assert playing(voices) == ["explosion"]
+    assert voices.played == 1
+    assert voices.dropped == 2
+
+
+def test_unknown_sound_is_dropped():
+    voices, _ = manager()
+    voices.play("missing")
+    voices.update()
+    assert voices.dropped == 1
+    assert playing(voices) == []
@@ -0,0 +1,25 @@
+import os
+
+from engine import GameEngine, headless_registry, FIXED_DT
+from entities.asteroid import Asteroid
+from entities.explosion import Explosion
+from gamestate import game_state
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_game_over_keeps_the_last_explosion_pooled():
+    registry = headless_registry(BASE_DIR)
+    engine = GameEngine(registry, save_high_scores=False)
+    engine.start(seed=0)
+    engine.lives = 1
+    engine.add_entity(Asteroid(registry.sprite("asteroid"), None, engine.player.x, engine.player.y, 0, 0))
+    engine.step(FIXED_DT)
+    assert engine.game_state == game_state.GameOver
+
+    explosions = [entity for entity in engine.entities if isinstance(entity, Explosion)]
+    assert len(explosions) == 1
+
+    # The next game hands it back to the pool
+    engine.start(seed=1)
+    assert engine.pool.free[Explosion] == explosions
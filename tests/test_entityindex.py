@@ -0,0 +1,58 @@
+from entities.GameObject import GameObject
+from entities.HostileObject import HostileObject
+from entities.WeaponObject import WeaponObject
+from entities.powerup import PowerUp
+from entityindex import EntityIndex
+
+
+def hostile():
+    return HostileObject(None, 0, 0, None)
+
+
+def test_roles_follow_the_entity_type_in_insertion_order():
+    index = EntityIndex()
+    a, b = hostile(), hostile()
+    weapon = WeaponObject(None, 0, 0, 0, None, speed=600)
+    powerup = PowerUp(None, 0, 0, None, ptype="life")
+    plain = GameObject(None, 0, 0)
+    for entity in (a, weapon, plain, b, powerup):
+        index.add(entity)
+
+    assert list(index) == [a, weapon, plain, b, powerup]
+    assert list(index.hostiles) == [a, b]
+    assert list(index.weapons) == [weapon]
+    assert list(index.powerups) == [powerup]
+
+    index.remove(a)
+    assert list(index) == [weapon, plain, b, powerup]
+    assert list(index.hostiles) == [b]
+    assert a not in index and len(index) == 4
+
+
+def test_handle_goes_stale_when_its_slot_is_reused():
+    index = EntityIndex()
+    entity = hostile()
+    old = index.add(entity)
+    assert index.get(old) is entity
+
+    index.remove(entity)
+    assert entity.handle is None
+    assert index.get(old) is None
+
+    # The pool hands the same object out again, in the same slot
+    new = index.add(entity)
+    assert new.slot == old.slot and new.generation == old.generation + 1
+    assert index.get(old) is None
+    assert index.get(new) is entity
+    assert index.get(None) is None
+
+
+def test_clear_invalidates_every_handle_and_reuses_slots_in_order():
+    index = EntityIndex()
+    entities = [hostile() for _ in range(3)]
+    handles = [index.add(entity) for entity in entities]
+    index.clear()
+
+    assert len(index) == 0 and not index.hostiles
+    assert all(index.get(handle) is None for handle in handles)
+    assert [index.add(hostile()).slot for _ in range(3)] == [0, 1, 2]
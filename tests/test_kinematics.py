@@ -0,0 +1,70 @@
+import numpy as np
+
+from entities.HostileObject import HostileObject
+from entities.laser import Laser
+from kinematics import KinematicsStore
+
+
+def mover(x, y, vel_x=0.0, vel_y=0.0):
+    return HostileObject(None, x, y, None, vel_x, vel_y)
+
+
+def test_step_moves_and_writes_back():
+    store = KinematicsStore()
+    entity = mover(100, 100, 60, -30)
+    entity.rotation_speed = 90
+    store.add(entity)
+
+    store.step(0.5, 800, 600)
+    assert (entity.x, entity.y, entity.rotation) == (130, 85, 45)
+    assert entity.active
+
+
+def test_step_deactivates_what_left_the_screen_past_its_margin():
+    store = KinematicsStore()
+    inside, outside = mover(-40, 300), mover(-60, 300)  # hostiles get a 50 px margin
+    laser = Laser(None, 400, 599, 0, None)  # flies up at 600 px/s, no margin
+    for entity in (inside, outside, laser):
+        store.add(entity)
+
+    store.step(1 / 60, 800, 600)
+    assert inside.active
+    assert not outside.active
+    assert not laser.active
+
+
+def test_swap_remove_moves_the_last_slot_into_the_hole():
+    store = KinematicsStore()
+    a, b, c = mover(1, 1, 1, 0), mover(2, 2, 2, 0), mover(3, 3, 3, 0)
+    for entity in (a, b, c):
+        store.add(entity)
+
+    store.remove(a)
+    assert len(store) == 2 and a not in store and a.kinematics_slot is None
+    assert c.kinematics_slot == 0 and store.entities == [c, b]
+    assert store.x[0] == 3 and store.vel_x[0] == 3
+    store.remove(a)  # already gone, nothing happens
+    assert len(store) == 2
+
+    store.step(1.0, 800, 600)
+    assert (b.x, c.x) == (4, 6)
+
+
+def test_grows_past_its_capacity():
+    store = KinematicsStore(capacity=2)
+    entities = [mover(i, 0) for i in range(5)]
+    for entity in entities:
+        store.add(entity)
+    assert store.capacity >= 5
+    assert store.x[:5].tolist() == [0, 1, 2, 3, 4]
+
+
+def test_hostiles_leaves_out_weapons():
+    store = KinematicsStore()
+    store.add(mover(1, 2, 3, 4))
+    store.add(Laser(None, 400, 300, 90, None))
+    store.add(mover(5, 6, 7, 8))
+    assert np.array_equal(store.hostiles(), [[1, 2, 3, 4], [5, 6, 7, 8]])
+
+    store.clear()
+    assert store.hostiles().shape == (0, 4)
@@ -0,0 +1,53 @@
+from entities.GameObject import GameObject
+from pool import ObjectPool
+
+
+class Thing(GameObject):
+    def __init__(self, x, y, tag="new"):
+        super().__init__(None, x, y)
+        self.tag = tag
+        self.hidden = self.deleted = False
+
+    def hide(self):
+        self.hidden = True
+
+    def delete(self):
+        self.deleted = True
+
+
+def test_released_object_is_reset_and_reused():
+    pool = ObjectPool()
+    thing = pool.acquire(Thing, 1, 2, tag="first")
+    thing.rotation = 90
+    pool.release(thing)
+    assert not thing.active and thing.hidden
+
+    again = pool.acquire(Thing, 3, 4, tag="second")
+    assert again is thing
+    assert (again.x, again.y, again.tag, again.rotation, again.active) == (3, 4, "second", 0.0, True)
+    assert not again.hidden
+    assert (pool.hits[Thing], pool.misses[Thing]) == (1, 1)
+
+
+def test_free_lists_are_per_type():
+    class Other(Thing):
+        pass
+
+    pool = ObjectPool()
+    pool.release(Thing(0, 0))
+    other = pool.acquire(Other, 0, 0)
+    assert type(other) is Other
+    assert pool.misses[Other] == 1 and len(pool.free[Thing]) == 1
+
+
+def test_release_past_max_free_deletes():
+    pool = ObjectPool(max_free=2)
+    things = [Thing(i, 0) for i in range(3)]
+    for thing in things:
+        pool.release(thing)
+    assert pool.free[Thing] == things[:2]
+    assert things[2].deleted and not things[0].deleted
+
+    pool.clear()
+    assert all(thing.deleted for thing in things)
+    assert pool.free[Thing] == []
@@ -0,0 +1,35 @@
+import os
+
+from engine import GameEngine, InputState, headless_registry, FIXED_DT
+from entities.powerup import PowerUp
+from replay import ReplayRecorder, load_replay, run_replay
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def play(engine, recorder, ticks):
+    for tick in range(ticks):
+        # Sweep the aim around so the ship turns, and thrust now and then
+        inputs = InputState(aim_x=400 + 300 * (tick % 7 - 3), aim_y=300 + 200 * (tick % 5 - 2),
+                            up=tick % 40 < 10, right=tick % 60 < 15, firing=True)
+        if recorder is not None:
+            recorder.record(FIXED_DT, inputs)
+        engine.step(FIXED_DT, inputs)
+
+
+def test_second_game_on_reused_engine_replays(tmp_path):
+    registry = headless_registry(BASE_DIR)
+    engine = GameEngine(registry, save_high_scores=False)
+
+    # Game A leaves the ship turned, boosted and mid cooldown
+    engine.start(seed=1)
+    play(engine, None, 300)
+    PowerUp(registry.sprite("powerup"), 0, 0, None, ptype="speed").apply(engine)
+
+    engine.start(seed=2)
+    recorder = ReplayRecorder(engine.seed, engine.width, engine.height)
+    play(engine, recorder, 600)
+    path = str(tmp_path / "b.replay")
+    recorder.save(path, engine)
+
+    assert run_replay(load_replay(path), GameEngine(registry, save_high_scores=False))
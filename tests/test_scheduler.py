@@ -0,0 +1,89 @@
+from Scheduler import scheduler
+
+TICK = 1 / 60
+
+
+def test_tasks_run_in_due_order_then_schedule_order():
+    s = scheduler()
+    calls = []
+    s.schedule_update(calls.append, 2, ("b",))
+    s.schedule_update(calls.append, 1, ("a",))
+    s.schedule_update(calls.append, 2, ("c",))
+
+    s.update_schedule(TICK)
+    assert calls == []
+    s.update_schedule(TICK)
+    assert calls == ["a"]
+    s.update_schedule(TICK)
+    assert calls == ["a", "b", "c"]
+
+
+def test_cancelled_task_never_runs():
+    s = scheduler()
+    calls = []
+    task = s.schedule_update(calls.append, 1, ("x",))
+    assert task.remaining() == 1
+    assert task.cancel()
+    assert not task.cancel()
+    assert task.remaining() == 0
+
+    for _ in range(3):
+        s.update_schedule(TICK)
+    assert calls == []
+    assert len(s.tasks_schedule) == 0
+
+
+def test_cancel_schedule_takes_the_oldest_call_of_a_function():
+    s = scheduler()
+    calls = []
+    s.schedule_update(calls.append, 5, ("first",))
+    s.schedule_update(calls.append, 3, ("second",))
+
+    func, args, time_left = s.cancel_schedule(calls.append)
+    assert (func, args, time_left) == (calls.append, ("first",), 5)
+    assert s.cancel_schedule(print) is None
+
+    for _ in range(6):
+        s.update_schedule(TICK)
+    assert calls == ["second"]
+
+
+def test_task_scheduled_in_a_callback_waits_for_the_next_update():
+    s = scheduler()
+    calls = []
+
+    def again(n):
+        calls.append(n)
+        if n < 3:
+            s.schedule_update(again, 0, (n + 1,))
+
+    s.schedule_update(again, 0, (1,))
+    s.update_schedule(TICK)
+    assert calls == [1]
+    s.update_schedule(TICK)
+    assert calls == [1, 2]
+    s.update_schedule(TICK)
+    s.update_schedule(TICK)
+    assert calls == [1, 2, 3]
+
+
+def test_cancel_all_clears_both_queues():
+    s = scheduler()
+    calls = []
+    update = s.schedule_update(calls.append, 0, ("update",))
+    frame = s.schedule_frame(calls.append, 0, ("frame",))
+    s.cancel_all()
+
+    s.update_schedule(TICK)
+    s.update_frame(TICK)
+    assert calls == []
+    assert not update.pending and not frame.pending
+
+
+def test_many_cancels_keep_the_heap_small():
+    s = scheduler()
+    tasks = [s.schedule_update(print, 100 + i) for i in range(1000)]
+    for task in tasks[:900]:
+        task.cancel()
+    assert len(s.tasks_schedule) == 100
+    assert len(s.tasks_schedule.heap) < 200
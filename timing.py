@@ -0,0 +1,167 @@
+import csv
+import json
+import time
+from typing import Dict, Iterable, List, Optional, TextIO
+
+import numpy as np
+import psutil
+
+
+class RingBuffer:
+    """Fixed-size history of floats, the oldest sample is overwritten once it is full."""
+
+    def __init__(self, size: int = 600) -> None:
+        self.data = np.zeros(size)
+        self.index = 0
+        self.count = 0
+
+    def append(self, value: float) -> None:
+        self.data[self.index] = value
+        self.index = (self.index + 1) % len(self.data)
+        if self.count < len(self.data):
+            self.count += 1
+
+    def values(self) -> np.ndarray:
+        """The stored samples, unordered."""
+        return self.data[:self.count]
+
+    def ordered(self) -> np.ndarray:
+        """The stored samples, oldest first."""
+        if self.count < len(self.data):
+            return self.data[:self.count]
+        return np.roll(self.data, -self.index)
+
+    def latest(self) -> float:
+        return float(self.data[self.index - 1]) if self.count else 0.0
+
+    def mean(self) -> float:
+        return float(self.values().mean()) if self.count else 0.0
+
+    def max(self) -> float:
+        return float(self.values().max()) if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        return float(np.percentile(self.values(), q)) if self.count else 0.0
+
+
+class PhaseTimer:
+    """Times the phases of the game loop tick by tick.
+
+    Call begin() at the start of a tick and mark(phase) at the end of each
+    phase; the time since the previous mark is charged to that phase. Phases
+    not reached in a tick count as 0. A tick is committed to the history (and
+    the stream, if any) when the next one begins.
+    """
+
+    def __init__(self, phases: Iterable[str], size: int = 600) -> None:
+        self.phases: List[str] = list(phases)
+        self.history: Dict[str, RingBuffer] = {phase: RingBuffer(size) for phase in self.phases}
+        self.current: Dict[str, float] = dict.fromkeys(self.phases, 0.0)
+        self.ticks = 0
+        self._started = False
+        self._last = 0.0
+        self._stream: Optional[TextIO] = None
+        self._writer = None
+
+    def begin(self) -> None:
+        if self._started:
+            self.commit()
+        self._started = True
+        self._last = time.perf_counter()
+
+    def mark(self, phase: str) -> None:
+        now = time.perf_counter()
+        self.current[phase] += now - self._last
+        self._last = now
+
+    def skip(self) -> None:
+        """Drops the time since the last mark, so the next phase starts counting now."""
+        self._last = time.perf_counter()
+
+    def commit(self) -> None:
+        """Pushes the current tick into the history and starts a blank one."""
+        self.ticks += 1
+        for phase, seconds in self.current.items():
+            self.history[phase].append(seconds)
+        if self._stream is not None:
+            self._write(self.current)
+        self.current = dict.fromkeys(self.phases, 0.0)
+        self._started = False
+
+    def stats(self) -> Dict[str, tuple]:
+        """Rolling (min, avg, p99) per phase in milliseconds."""
+        stats = {}
+        for phase, buffer in self.history.items():
+            values = buffer.values()
+            if len(values) == 0:
+                stats[phase] = (0.0, 0.0, 0.0)
+            else:
+                stats[phase] = (values.min() * 1e3, values.mean() * 1e3, np.percentile(values, 99) * 1e3)
+        return stats
+
+    def summary(self) -> List[str]:
+        """One 'phase: min/avg/p99 ms' line per phase, for the debug overlay."""
+        return [f"{phase}: {lo:.2f}/{avg:.2f}/{p99:.2f} ms" for phase, (lo, avg, p99) in self.stats().items()]
+
+    def stream(self, path: str) -> None:
+        """Writes every committed tick to `path`, as JSON lines if it ends in .jsonl and CSV otherwise."""
+        self.close()
+        self._stream = open(path, "w", newline="")
+        if path.endswith(".jsonl"):
+            self._writer = None
+        else:
+            self._writer = csv.writer(self._stream)
+            self._writer.writerow(["tick"] + self.phases)
+
+    def _write(self, row: Dict[str, float]) -> None:
+        if self._writer is None:
+            self._stream.write(json.dumps({"tick": self.ticks, **{p: round(s * 1e3, 4) for p, s in row.items()}}) + "\n")
+        else:
+            self._writer.writerow([self.ticks] + [f"{row[p] * 1e3:.4f}" for p in self.phases])
+
+    def close(self) -> None:
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+            self._writer = None
+
+
+class StatsCollector:
+    """Rolling frame, tick, entity count and memory history for the debug overlay.
+
+    Recording a frame or a tick is a couple of ring buffer writes. RSS is only
+    read in sample(), through one psutil handle kept for the whole run.
+    """
+
+    def __init__(self, size: int = 120) -> None:
+        self.process = psutil.Process()
+        self.frame_intervals = RingBuffer(size)  # between two draws, stalls show up here
+        self.tick_intervals = RingBuffer(size)
+        self.tick_times = RingBuffer(size)  # time spent inside a tick
+        self.entities = RingBuffer(size)
+        self.rss = RingBuffer(size)
+        self._last_tick: Optional[float] = None
+
+    def frame(self, interval: float) -> None:
+        self.frame_intervals.append(interval)
+
+    def tick(self, start: float, end: float, entities: int) -> None:
+        if self._last_tick is not None:
+            self.tick_intervals.append(start - self._last_tick)
+        self._last_tick = start
+        self.tick_times.append(end - start)
+        self.entities.append(entities)
+
+    def sample(self) -> None:
+        self.rss.append(self.process.memory_info().rss)
+
+    def summary(self) -> List[str]:
+        frames, ticks = self.frame_intervals, self.tick_times
+        fps = 1 / frames.mean() if frames.count else 0
+        tps = 1 / self.tick_intervals.mean() if self.tick_intervals.count else 0
+        return [
+            f"FPS: {fps:.2f}, frame {frames.mean() * 1e3:.1f}/{frames.percentile(99) * 1e3:.1f}/{frames.max() * 1e3:.1f} ms",
+            f"TPS: {tps:.2f}, tick {ticks.mean() * 1e3:.2f}/{ticks.percentile(99) * 1e3:.2f}/{ticks.max() * 1e3:.2f} ms",
+            f"Entities: {self.entities.latest():.0f} (max {self.entities.max():.0f})",
+            f"Memory Usage: {self.rss.latest() / 2**20:.2f} MiB",
+        ]
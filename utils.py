@@ -1,9 +1,11 @@
 import math
 import numpy as np
-from typing import List, Tuple, Union, Dict
-from pyglet.image import AbstractImage
+from collections import OrderedDict
+from typing import TYPE_CHECKING, List, Tuple, Union, Dict
+
+if TYPE_CHECKING:
+    from pyglet.image import AbstractImage
 
-mask_cache: Dict[int, np.ndarray] = {}
 
 def create_alpha_mask(image):
     raw = image.get_image_data()
@@ -12,6 +14,111 @@ def create_alpha_mask(image):
     array = array.reshape((raw.height, raw.width, 4))
     return array[:, :, 3] > 0
 
+
+def edge_pixels(mask: np.ndarray) -> np.ndarray:
+    """Returns a mask of the solid pixels that touch a transparent pixel (or the image border)."""
+    padded = np.pad(mask, 1, constant_values=False)
+    interior = (
+        padded[:-2, 1:-1] & padded[2:, 1:-1] & padded[1:-1, :-2] & padded[1:-1, 2:]
+    )
+    return mask & ~interior
+
+
+class CollisionShape:
+    """Alpha mask of an image plus its solid pixels, already shifted by the anchor."""
+
+    __slots__ = ("mask", "lx", "ly", "anchor")
+
+    def __init__(self, mask: np.ndarray, anchor: Tuple[int, int], step: int = 1, edges_only: bool = False) -> None:
+        self.mask = mask
+        self.anchor = anchor
+
+        solid = edge_pixels(mask) if edges_only else mask
+        if step > 1:
+            # Keep every `step`-th pixel on both axes, the mask itself stays full-res
+            sampled = np.zeros_like(solid)
+            sampled[::step, ::step] = solid[::step, ::step]
+            solid = sampled
+        ys, xs = np.nonzero(solid)
+        self.lx = (xs - anchor[0]).astype(np.float32)
+        self.ly = (ys - anchor[1]).astype(np.float32)
+
+
+class CollisionShapeCache:
+    """LRU cache of CollisionShapes keyed by the image object itself.
+
+    Holding the image as part of the key keeps it alive, so unlike an `id()` key
+    an entry can never be handed back for a different image.
+    """
+
+    def __init__(self, maxsize: int = 64) -> None:
+        self.maxsize = maxsize
+        self._shapes: "OrderedDict[Tuple[AbstractImage, int, bool], CollisionShape]" = OrderedDict()
+        self._masks: "Dict[AbstractImage, np.ndarray]" = {}
+        # Masks handed in by the loader, kept for good
+        self._precomputed: "Dict[AbstractImage, np.ndarray]" = {}
+
+    def __len__(self) -> int:
+        return len(self._shapes)
+
+    def clear(self) -> None:
+        self._shapes.clear()
+        self._masks.clear()
+
+    def add_mask(self, image, mask: np.ndarray) -> None:
+        """Registers a precomputed alpha mask for an image, so it is never read back from its texture."""
+        self._precomputed[image] = mask
+
+    def get(self, image, step: int = 1, edges_only: bool = False) -> CollisionShape:
+        """Returns the collision shape of an image, building it on first use.
+
+        Args:
+            image: the sprite image
+            step (int, optional): only keep every `step`-th solid pixel. Defaults to 1.
+            edges_only (bool, optional): only keep the outline of the shape. Defaults to False.
+        """
+        key = (image, step, edges_only)
+        anchor = (image.anchor_x, image.anchor_y)
+        shape = self._shapes.get(key)
+        if shape is not None and shape.anchor == anchor:
+            self._shapes.move_to_end(key)
+            return shape
+
+        mask = self._masks.get(image)
+        if mask is None:
+            mask = self._precomputed.get(image)
+        if mask is None:
+            mask = create_alpha_mask(image)
+        shape = CollisionShape(mask, anchor, step, edges_only)
+        self._shapes[key] = shape
+        self._masks[image] = mask
+
+        while len(self._shapes) > self.maxsize:
+            (old_image, _, _), _ = self._shapes.popitem(last=False)
+            if not any(k[0] is old_image for k in self._shapes):
+                del self._masks[old_image]
+        return shape
+
+
+shape_cache = CollisionShapeCache()
+
+
+def sprite_scale(sprite) -> Tuple[float, float]:
+    """Returns the effective (x, y) scale of a sprite, pyglet keeps `scale` separate from `scale_x`/`scale_y`."""
+    scale = getattr(sprite, "scale", 1.0)
+    return sprite.scale_x * scale, sprite.scale_y * scale
+
+
+def sample_step(scale_points: float, scale_mask: float) -> int:
+    """Picks how many source pixels can be skipped while staying under one pixel of the other mask."""
+    if scale_points <= 0:
+        return 1
+    ratio = abs(scale_mask) / scale_points
+    step = 1
+    while step * 2 <= ratio and step < 8:
+        step *= 2
+    return step
+
 def check_circle_collision(sprite_a, sprite_b):
     # A rotation-safe quick distance check. 
     # Calculates a generous radius based on the sprite's largest dimension.
@@ -68,54 +175,140 @@ def are_sprites_colliding(sprite_a, sprite_b) -> bool:
     if not check_circle_collision(sprite_a, sprite_b):
         return False
 
-    if id(sprite_a.image) not in mask_cache:
-        mask_cache[id(sprite_a.image)] = create_alpha_mask(sprite_a.image)
-
-    if id(sprite_b.image) not in mask_cache:
-        mask_cache[id(sprite_b.image)] = create_alpha_mask(sprite_b.image)
+    # Project the sprite with fewer solid pixels into the other one's mask
+    shape_a = shape_cache.get(sprite_a.image)
+    shape_b = shape_cache.get(sprite_b.image)
+    if len(shape_a.lx) > len(shape_b.lx):
+        sprite_a, sprite_b = sprite_b, sprite_a
+        shape_b = shape_a
 
-    mask_a = mask_cache[id(sprite_a.image)]
-    mask_b = mask_cache[id(sprite_b.image)]
+    sax, say = sprite_scale(sprite_a)
+    sbx, sby = sprite_scale(sprite_b)
+    step = sample_step(min(abs(sax), abs(say)), min(abs(sbx), abs(sby)))
+    shape_a = shape_cache.get(sprite_a.image, step)
+    mask_b = shape_b.mask
 
-    
-
-    # 2. Get all local coordinates where Sprite A has solid pixels
-    ys, xs = np.nonzero(mask_a)
-    
-    if len(xs) == 0:  # Safety check if sprite is fully transparent
+    # 2. Local coordinates where Sprite A has solid pixels (precomputed)
+    if len(shape_a.lx) == 0:  # Safety check if sprite is fully transparent
         return False
 
-    # --- 3. Vectorized Local to World (Sprite A) ---
-    lx = (xs - sprite_a.image.anchor_x) * sprite_a.scale_x
-    ly = (ys - sprite_a.image.anchor_y) * sprite_a.scale_y
-    
+    # --- 3. Local to World (Sprite A) folded into World to Local (Sprite B) ---
+    # Both rotations and scales collapse into one 2x2 matrix plus an offset
     rad_a = -math.radians(sprite_a.rotation)
     cr_a, sr_a = math.cos(rad_a), math.sin(rad_a)
-    
-    wx = lx * cr_a - ly * sr_a + sprite_a.x
-    wy = lx * sr_a + ly * cr_a + sprite_a.y
-
-    # --- 4. Vectorized World to Local (Sprite B) ---
-    dx = wx - sprite_b.x
-    dy = wy - sprite_b.y
-    
     rad_b = math.radians(sprite_b.rotation)
     cr_b, sr_b = math.cos(rad_b), math.sin(rad_b)
-    
-    bx = dx * cr_b - dy * sr_b
-    by = dx * sr_b + dy * cr_b
-    
-    bx /= (sprite_b.scale_x if sprite_b.scale_x != 0 else 1)
-    by /= (sprite_b.scale_y if sprite_b.scale_y != 0 else 1)
-    
-    # Round to nearest pixel and convert to integer indices
-    bx = np.round(bx + sprite_b.image.anchor_x).astype(int)
-    by = np.round(by + sprite_b.image.anchor_y).astype(int)
 
-    # --- 5. Vectorized Bounds Check & Collision ---
+    inv_bx = 1 / (sbx if sbx != 0 else 1)
+    inv_by = 1 / (sby if sby != 0 else 1)
+
+    # world = R_a * S_a * local + pos_a ; b = S_b^-1 * R_b * (world - pos_b)
+    rot_c = cr_a * cr_b - sr_a * sr_b
+    rot_s = sr_a * cr_b + cr_a * sr_b
+    dx = sprite_a.x - sprite_b.x
+    dy = sprite_a.y - sprite_b.y
+    ox = (dx * cr_b - dy * sr_b) * inv_bx + sprite_b.image.anchor_x + 0.5
+    oy = (dx * sr_b + dy * cr_b) * inv_by + sprite_b.image.anchor_y + 0.5
+
+    # +0.5 then truncation rounds to the nearest pixel once the bounds check drops negatives
+    bx = shape_a.lx * (rot_c * sax * inv_bx) - shape_a.ly * (rot_s * say * inv_bx) + ox
+    by = shape_a.lx * (rot_s * sax * inv_by) + shape_a.ly * (rot_c * say * inv_by) + oy
+
+    # --- 4. Vectorized Bounds Check & Collision ---
     # Create a boolean array of points that fall within Sprite B's image bounds
     valid = (bx >= 0) & (bx < mask_b.shape[1]) & (by >= 0) & (by < mask_b.shape[0])
     
     # Check if ANY of those valid points hit a solid pixel in Sprite B's mask
     # This evaluates the entire array instantly
-    return bool(np.any(mask_b[by[valid], bx[valid]]))
\ No newline at end of file
+    return bool(np.any(mask_b[by[valid].astype(np.intp), bx[valid].astype(np.intp)]))
+
+
+def colliding_indices(sprite, image, xs, ys, rotations, scales_x, scales_y) -> np.ndarray:
+    """Tests one sprite against many placements of another image in a single NumPy pass.
+
+    Args:
+        sprite: the sprite every candidate is tested against (usually a HostileObject)
+        image: the image shared by all candidates
+        xs, ys, rotations, scales_x, scales_y: per-candidate transforms, array-like of equal length.
+            Scales are the effective ones, see sprite_scale().
+
+    Returns:
+        np.ndarray: sorted indices of the candidates that overlap `sprite`.
+    """
+    xs = np.asarray(xs, dtype=np.float64)
+    ys = np.asarray(ys, dtype=np.float64)
+    rotations = np.asarray(rotations, dtype=np.float64)
+    scales_x = np.asarray(scales_x, dtype=np.float64)
+    scales_y = np.asarray(scales_y, dtype=np.float64)
+
+    # 1. Vectorized circle check, same radii as check_circle_collision
+    radius = max(sprite.width, sprite.height) / 2.0
+    radii = np.maximum(image.width * np.abs(scales_x), image.height * np.abs(scales_y)) / 2.0
+    dx = xs - sprite.x
+    dy = ys - sprite.y
+    idx = np.flatnonzero(dx * dx + dy * dy <= (radius + radii) ** 2)
+    if idx.size == 0:
+        return idx
+
+    # 2. Candidate points are projected into the sprite's mask
+    sbx, sby = sprite_scale(sprite)
+    step = sample_step(
+        float(min(np.abs(scales_x[idx]).min(), np.abs(scales_y[idx]).min())),
+        min(abs(sbx), abs(sby)),
+    )
+    shape = shape_cache.get(image, step)
+    mask = shape_cache.get(sprite.image).mask
+    if len(shape.lx) == 0:
+        return idx[:0]
+
+    rad_b = math.radians(sprite.rotation)
+    cr_b, sr_b = math.cos(rad_b), math.sin(rad_b)
+    inv_bx = 1 / (sbx if sbx != 0 else 1)
+    inv_by = 1 / (sby if sby != 0 else 1)
+
+    # One combined rotation per candidate, shape (k, 1) so it broadcasts over the points
+    angle = rad_b - np.radians(rotations[idx])
+    rot_c = np.cos(angle)[:, None]
+    rot_s = np.sin(angle)[:, None]
+    sx = scales_x[idx][:, None]
+    sy = scales_y[idx][:, None]
+    dx = dx[idx]
+    dy = dy[idx]
+    ox = ((dx * cr_b - dy * sr_b) * inv_bx + sprite.image.anchor_x + 0.5)[:, None]
+    oy = ((dx * sr_b + dy * cr_b) * inv_by + sprite.image.anchor_y + 0.5)[:, None]
+
+    lx = shape.lx[None, :]
+    ly = shape.ly[None, :]
+    bx = lx * (rot_c * sx * inv_bx) - ly * (rot_s * sy * inv_bx) + ox
+    by = lx * (rot_s * sx * inv_by) + ly * (rot_c * sy * inv_by) + oy
+
+    # 3. Bounds check and mask lookup for every (candidate, point) pair at once
+    valid = (bx >= 0) & (bx < mask.shape[1]) & (by >= 0) & (by < mask.shape[0])
+    hit = np.zeros(valid.shape, dtype=bool)
+    hit[valid] = mask[by[valid].astype(np.intp), bx[valid].astype(np.intp)]
+    return idx[hit.any(axis=1)]
+
+
+def sprites_colliding_with(sprite, others: List) -> List[int]:
+    """Returns the indices of `others` that collide with `sprite`, one batched pass per image."""
+    if sprite.image is None:
+        raise ValueError("Both sprites must have an image for collision detection.")
+
+    groups: Dict[object, List[int]] = {}
+    for i, other in enumerate(others):
+        groups.setdefault(other.image, []).append(i)
+
+    hits: List[int] = []
+    for image, members in groups.items():
+        found = colliding_indices(
+            sprite,
+            image,
+            [others[i].x for i in members],
+            [others[i].y for i in members],
+            [others[i].rotation for i in members],
+            [sprite_scale(others[i])[0] for i in members],
+            [sprite_scale(others[i])[1] for i in members],
+        )
+        hits.extend(members[i] for i in found)
+    hits.sort()
+    return hits